@@ -1,30 +1,159 @@
-from dotenv import load_dotenv
+import hashlib
+import os
+import traceback
+from dataclasses import asdict
+from datetime import date
+from functools import cache
+from typing import Dict, List, Literal, Optional, Union
 
-load_dotenv()
+# No Lambda as variáveis já vêm da configuração da função: python-dotenv só é
+# carregado localmente.
+if "AWS_LAMBDA_FUNCTION_NAME" not in os.environ:
+    from dotenv import load_dotenv
 
+    load_dotenv()
 
-from fastapi import FastAPI, HTTPException
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from src.schemas import GenerateTeamsRequest
+from fastapi.responses import JSONResponse
+from src.cache import response_cache
+from src.conditional import is_not_modified, version_headers
+from src.export import export_response
+from src.idempotency import IDEMPOTENCY_METHODS, IdempotencyConflict, IdempotencyStore, StoredResponse
+from src.jobs import InlineJobQueue, create_job_queue
+from src.repositories import get_client
+from src.responses import ORJSONResponse
+from src.schemas import (
+    CommitTeamsRequest,
+    CommitTeamsResponse,
+    GamePageSchema,
+    GameSchema,
+    GameSnapshotSchema,
+    GenerateTeamsRequest,
+    GenerateTeamsResponse,
+    PlayerPageSchema,
+    PlayerSchema,
+    RosterPlayerSchema,
+    TeamPlayerSchema,
+)
 from src.services import (
+    AsyncGamePlayerService,
+    AsyncGameService,
+    AsyncPlayerService,
     GameAddSchema,
     GamePlayerAddSchema,
+    GamePlayerPaymentsSchema,
     GamePlayerService,
     GamePlayerUpdateSchema,
     GameService,
     GameTeamService,
     GameUpdateSchema,
+    ParsedPlayer,
+    PlayerAliasSchema,
     PlayerService,
 )
+from src.services.game_player_service import EXPORT_FIELDS
+from src.services.game_service import GAME_FIELDS
+from src.services.game_team_service import raw_key
+from src.services.player_service import player_index, player_name_cache
+from src.utils import normalize_name
+
+
+# -------------------------------------------------------------------
+#  Serviços
+#  Criados no primeiro uso (o client do Supabase junto), para o init do
+#  Lambda não pagar por eles. EAGER_INIT=true cria tudo no import.
+# -------------------------------------------------------------------
+@cache
+def get_game_team_service() -> GameTeamService:
+    return GameTeamService()
+
+
+@cache
+def get_player_service() -> PlayerService:
+    return PlayerService(get_client())
+
+
+@cache
+def get_game_service() -> GameService:
+    return GameService(get_client())
+
+
+@cache
+def get_game_player_service() -> GamePlayerService:
+    return GamePlayerService(get_client(), get_player_service(), get_game_service())
+
+
+# Client async criado no primeiro uso, dentro do event loop
+@cache
+def get_async_game_service() -> AsyncGameService:
+    return AsyncGameService()
+
+
+@cache
+def get_async_game_player_service() -> AsyncGamePlayerService:
+    return AsyncGamePlayerService(player_service=AsyncPlayerService(), game_service=get_async_game_service())
+
+
+if os.environ.get("EAGER_INIT", "false").lower() == "true":
+    import emoji  # noqa: F401
 
-# Inicializa serviços
-game_team_service = GameTeamService()
-player_service = PlayerService()
-game_player_service = GamePlayerService()
-game_service = GameService()
+    get_game_player_service()
+
+# Pré-carrega o cache de nomes de jogadores durante o init do Lambda
+if os.environ.get("PLAYER_CACHE_WARM", "false").lower() == "true":
+    get_player_service().warm_cache()
+
+
+# Fila das escritas adiadas (generate com defer); JOB_QUEUE=inline para rodar offline
+@cache
+def get_job_queue() -> InlineJobQueue:
+    return create_job_queue({"roster": _save_roster_job})
+
+
+@cache
+def get_idempotency_store() -> IdempotencyStore:
+    return IdempotencyStore()
+
+
+# Inicializa FastAPI. Rotas com response_model serializam pelo pydantic
+# (dump_json); as demais passam pelo orjson.
+app = FastAPI(title="Football Games API", default_response_class=ORJSONResponse)
+
+
+# Idempotency-Key nas escritas: a repetição devolve a resposta guardada sem
+# executar o endpoint de novo (registrado antes do CORS, que fica por fora)
+@app.middleware("http")
+async def idempotency(request: Request, call_next):
+    key = request.headers.get("idempotency-key")
+    if not key or request.method not in IDEMPOTENCY_METHODS:
+        return await call_next(request)
+
+    store = get_idempotency_store()
+    key = f"{request.method} {request.url.path} {key}"
+    request_hash = hashlib.sha256(await request.body()).hexdigest()
+    try:
+        stored = await store.begin(key, request_hash)
+    except IdempotencyConflict as exc:
+        return JSONResponse({"detail": str(exc)}, status_code=exc.status_code)
+    if stored is not None:
+        return stored.to_response()
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        await store.abort(key)
+        raise
+    # erro do servidor: libera a chave para o cliente tentar de novo
+    if response.status_code >= 500:
+        await store.abort(key)
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    await store.complete(key, request_hash, StoredResponse(response.status_code, body, response.headers.get("content-type")))
+    return Response(content=body, status_code=response.status_code, headers=dict(response.headers))
 
-# Inicializa FastAPI
-app = FastAPI(title="Football Games API")
 
 # Configura CORS
 app.add_middleware(
@@ -33,9 +162,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Idempotency-Replayed"],
 )
 
 
+def _split_fields(fields: Optional[str]) -> Optional[list[str]]:
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+async def _game_version_headers(resource: str, game_id: str) -> tuple[str | None, dict[str, str]]:
+    """
+    Versão (games.updated_at) e ETag / Last-Modified de um recurso do jogo. A
+    versão vai também para o serviço: o corpo em cache precisa ser dessa versão.
+    """
+    version = await get_async_game_service().get_game_version(game_id)
+    if version is None:
+        return None, {}
+    return version, version_headers(f"{resource}:{game_id}", version)
+
+
 # -------------------------------------------------------------------
 #  Raiz
 # -------------------------------------------------------------------
@@ -45,129 +192,348 @@ def health():
     return {"message": "ok"}
 
 
+@app.get("/cache/stats", tags=["cache"])
+def cache_stats():
+    return {
+        "responses": response_cache.stats(),
+        "player_names": player_name_cache.stats(),
+        "player_index": player_index.stats(),
+    }
+
+
 # -------------------------------------------------------------------
 #  /players
 # -------------------------------------------------------------------
-@app.get("/players/{player_id}", tags=["players"])
+@app.get("/players/match", tags=["players"])
+def match_player(name: str, limit: int = Query(5, ge=1, le=50)):
+    return get_player_service().match_player(name, limit)
+
+
+@app.get("/players/{player_id}", response_model=Optional[PlayerSchema], tags=["players"])
 def get_player_by_id(player_id: str):
-    return player_service.get_player_by_id(player_id)
+    return get_player_service().get_player_by_id(player_id)
+
+
+@app.get("/players/{player_id}/stats", tags=["players"])
+def get_player_stats(player_id: str):
+    stats = get_player_service().get_player_stats(player_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return stats
 
 
 @app.get("/players/{player_id}/games", tags=["players"])
 def get_games_by_player_id(player_id: str):
-    return player_service.get_games_by_player_id(player_id)
+    return get_player_service().get_games_by_player_id(player_id)
 
 
-@app.get("/players", tags=["players"])
-def get_players():
-    return player_service.get_players()
+# ?fields= devolve só algumas colunas: exclude_unset não completa o resto com null
+@app.get(
+    "/players",
+    response_model=Union[List[PlayerSchema], PlayerPageSchema],
+    response_model_exclude_unset=True,
+    tags=["players"],
+)
+def get_players(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Colunas separadas por vírgula"),
+):
+    try:
+        return get_player_service().get_players(limit, cursor, _split_fields(fields))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/players/{player_id}/aliases", tags=["players"])
+def add_player_alias(player_id: str, body: PlayerAliasSchema):
+    try:
+        alias = get_player_service().add_alias(player_id, body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if alias is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return alias
 
 
 @app.delete("/players/{player_id}", status_code=204, tags=["players"])
 def delete_player(player_id: str):
-    return player_service.delete_player(player_id)
+    return get_player_service().delete_player(player_id)
 
 
 # -------------------------------------------------------------------
 #  /games
 # -------------------------------------------------------------------
-@app.post("/games", tags=["games"])
+@app.post("/games", response_model=Optional[GameSchema], tags=["games"])
 def create_game(body: GameAddSchema):
-    return game_service.get_or_create_game(body)
+    return get_game_service().get_or_create_game(body)
 
 
-@app.patch("/games/{game_id}", tags=["games"])
+@app.patch("/games/{game_id}", response_model=Optional[GameSchema], tags=["games"])
 def update_game(game_id: str, body: GameUpdateSchema):
-    return game_service.update_game(game_id, body)
+    return get_game_service().update_game(game_id, body)
+
+
+@app.get(
+    "/games",
+    response_model=Union[List[GameSchema], GamePageSchema],
+    response_model_exclude_unset=True,
+    tags=["games"],
+)
+def get_games(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Colunas separadas por vírgula"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    try:
+        return get_game_service().get_games(limit, cursor, _split_fields(fields), date_from, date_to)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 
+@app.get("/games/{game_id}", response_model=Optional[GameSchema], tags=["games"])
+async def get_game(game_id: str, request: Request, response: Response):
+    version, headers = await _game_version_headers("game", game_id)
+    if headers and is_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
 
-@app.get("/games", tags=["games"])
-def get_games():
-    return game_service.get_games()
+    response.headers.update(headers)
+    return await get_async_game_service().get_game(game_id, version)
 
 
-@app.get("/games/{game_id}", tags=["games"])
-def get_game(game_id: str):
-    return game_service.get_game(game_id)
+@app.get("/games/{game_id}/snapshot", response_model=Optional[GameSnapshotSchema], tags=["games"])
+async def get_game_snapshot(game_id: str, request: Request, response: Response):
+    version, headers = await _game_version_headers("snapshot", game_id)
+    if headers and is_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return await get_async_game_service().get_snapshot(game_id, version)
 
 
 @app.delete("/games/{game_id}", tags=["games"])
 def delete_game(game_id: str):
-    return game_service.delete_game(game_id)
+    return get_game_service().delete_game(game_id)
 
 
 # -------------------------------------------------------------------
 #  /games/players
 # -------------------------------------------------------------------
 @app.post("/games/{game_id}/players", tags=["games/players"])
-def add_player_in_game(game_id: str, body: GamePlayerAddSchema):
-    return game_player_service.add_player_in_game(game_id, body)
+async def add_player_in_game(game_id: str, body: GamePlayerAddSchema):
+    try:
+        return await get_async_game_player_service().add_player_in_game(game_id, body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/games/{game_id}/players/payments", tags=["games/players"])
+async def pay_players_in_game(game_id: str, body: GamePlayerPaymentsSchema):
+    results = await get_async_game_player_service().pay_players(game_id, body)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return results
 
 
 @app.patch("/games/{game_id}/players/{player_id}", tags=["games/players"])
-def update_player_in_game(game_id: str, player_id: str, body: GamePlayerUpdateSchema):
-    player = game_player_service.get_player_in_game(game_id, player_id)
+async def update_player_in_game(game_id: str, player_id: str, body: GamePlayerUpdateSchema):
+    player = await get_async_game_player_service().update_player_in_game(game_id, player_id, body)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found in game")
-    return game_player_service.update_player_in_game(game_id, player_id, body)
+    return player
 
 
-@app.get("/games/{game_id}/players", tags=["games/players"])
-def get_players_in_game(game_id: str):
-    return game_player_service.get_players_in_game(game_id)
+@app.get("/games/{game_id}/players", response_model=Optional[List[RosterPlayerSchema]], tags=["games/players"])
+async def get_players_in_game(game_id: str, request: Request, response: Response):
+    version, headers = await _game_version_headers("players", game_id)
+    if headers and is_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return await get_async_game_player_service().get_players_in_game(game_id, version)
 
 
 @app.delete("/games/{game_id}/players/{player_id}", tags=["games/players"])
 def delete_player_in_game(game_id: str, player_id: str):
-    return game_player_service.delete_player_in_game(game_id, player_id)
+    return get_game_player_service().delete_player_in_game(game_id, player_id)
 
 
 # -------------------------------------------------------------------
 #  /games/teams
 # -------------------------------------------------------------------
-@app.post("/games/{game_id}/teams/generate", tags=["games/teams"])
-def generate_teams_for_game(game_id: str, body: GenerateTeamsRequest):
-    # 1) parse do texto
-    parsed_players = game_team_service.parse_jogadores_raw(body.jogadores_raw)
-
+def _assign_player_ids(parsed_players: list, player_ids: dict) -> None:
     for player in parsed_players:
-        if player["invited_by_name"]:
-            player["invited_by_id"] = player_service.get_or_create_player(player["invited_by_name"])["id"]
-        else:
-            player["invited_by_id"] = None
+        if player.invited_by_name:
+            player.invited_by_id = player_ids[player.invited_by_name.strip()]
 
-        player["player_id"] = player_service.get_or_create_player(player["name"])["id"]
+        player.player_id = player_ids[player.name.strip()]
+
+
+def _save_roster(game_id: str, parsed_players: list) -> list[dict]:
+    """Resolve/cria os jogadores da lista e grava o elenco inteiro em um único upsert."""
+    names = [p.name for p in parsed_players] + [p.invited_by_name for p in parsed_players]
+    _assign_player_ids(parsed_players, get_player_service().get_or_create_players(names))
+    return get_game_player_service().upsert_game_players(game_id, parsed_players)
 
-    # 2) gera times (apenas em memória)
-    goalkeepers = [dict(p) for p in parsed_players if p["is_goalkeeper"] is True]
-    players = [dict(j) for j in parsed_players if j["is_goalkeeper"] is False]
 
-    teams = game_team_service.generate_teams(
-        players,
-        body.zagueiros_fixos,
-        body.habilidosos,
-        body.players_per_team,
-    )
+def _save_roster_job(payload: dict) -> list[dict]:
+    """Job "roster" da fila: payload {"game_id", "players": [ParsedPlayer como dict]}."""
+    return _save_roster(payload["game_id"], [ParsedPlayer(**p) for p in payload["players"]])
 
-    for team_name, players in teams.items():
+
+# sem preview/defer/best_of a resposta é só o dicionário de times; exclude_unset
+# mantém fora da resposta os campos (score, job_id...) que o modo não preenche
+@app.post(
+    "/games/{game_id}/teams/generate",
+    response_model=Union[GenerateTeamsResponse, Dict[str, List[TeamPlayerSchema]]],
+    response_model_exclude_unset=True,
+    tags=["games/teams"],
+)
+def generate_teams_for_game(game_id: str, body: GenerateTeamsRequest):
+    # 1) parse do texto (em cache pelo hash da lista)
+    parsed_players = get_game_team_service().parse_jogadores_raw_cached(body.jogadores_raw)
+
+    # resolve todos os nomes (jogadores e convidadores) de uma vez; o preview e o
+    # defer não criam jogadores e guardam a resolução pelo hash da lista (o defer
+    # só precisa dela para os ratings)
+    names = [p.name for p in parsed_players] + [p.invited_by_name for p in parsed_players]
+    try:
+        if body.preview or (body.defer and body.mode in ("balanced", "best_of")):
+            player_ids = get_player_service().find_player_ids(names, cache_key=raw_key(body.jogadores_raw))
+            _assign_player_ids(parsed_players, player_ids)
+        elif not body.defer:
+            _assign_player_ids(parsed_players, get_player_service().get_or_create_players(names))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # 2) gera times (apenas em memória)
+    goalkeepers = [p for p in parsed_players if p.is_goalkeeper]
+    players = [p for p in parsed_players if not p.is_goalkeeper]
+
+    result = None
+    if body.mode in ("balanced", "best_of"):
+        ratings = {normalize_name(name): value for name, value in (body.ratings or {}).items()}
+        stored = get_player_service().get_ratings(
+            [p.player_id for p in players if p.player_id and p.name not in ratings]
+        )
         for p in players:
-            game_player_service.upsert_game_player(
-                game_id,
-                p["player_id"],
-                p["is_goalkeeper"],
-                p["is_visitor"],
-                p["invited_by_id"],
-                p["team"],
-            )
-
-    for g in goalkeepers:
-        game_player_service.upsert_game_player(
-            game_id,
-            g["player_id"],
-            g["is_goalkeeper"],
-            g["is_visitor"],
-            g["invited_by_id"],
-            None,
+            p.rating = ratings.get(p.name, stored.get(p.player_id))
+
+    if body.mode == "balanced":
+        teams = get_game_team_service().balance_teams(
+            players,
+            body.zagueiros_fixos,
+            body.habilidosos,
+            body.players_per_team,
+            seed=body.seed,
+        )
+    elif body.mode == "best_of":
+        result = get_game_team_service().sample_teams(
+            players,
+            body.zagueiros_fixos,
+            body.habilidosos,
+            body.players_per_team,
+            samples=body.samples,
+            seed=body.seed,
+        )
+        teams = result.teams
+    else:
+        teams = get_game_team_service().generate_teams(
+            players,
+            body.zagueiros_fixos,
+            body.habilidosos,
+            body.players_per_team,
         )
 
+    if body.preview:
+        response = {"game_id": game_id, "teams": teams, "preview": True}
+        if result is not None:
+            response.update(score=result.score, runner_up_scores=result.runner_up_scores)
+        return response
+
+    if body.defer:
+        # responde já com os times; o elenco é gravado pela fila (GET /jobs/{job_id}).
+        # O payload vai para a tabela jobs: qualquer container consegue terminar o job
+        roster = [asdict(p) for p in players + goalkeepers]
+        try:
+            job = get_job_queue().submit("roster", f"roster:{game_id}", {"game_id": game_id, "players": roster})
+            response = {"game_id": game_id, "teams": teams, "job_id": job.id, "status": job.status}
+        except RuntimeError:
+            # sem a linha em jobs ninguém termina a escrita depois: grava agora
+            traceback.print_exc()
+            try:
+                _save_roster(game_id, players + goalkeepers)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            response = {"game_id": game_id, "teams": teams, "job_id": None, "status": "done"}
+        if result is not None:
+            response.update(score=result.score, runner_up_scores=result.runner_up_scores)
+        return response
+
+    # 3) persiste o elenco inteiro (goleiros ficam sem time) em um único upsert
+    get_game_player_service().upsert_game_players(game_id, players + goalkeepers)
+
+    if result is not None:
+        return {
+            "game_id": game_id,
+            "teams": teams,
+            "score": result.score,
+            "runner_up_scores": result.runner_up_scores,
+        }
     return teams
+
+
+@app.post("/games/{game_id}/teams/commit", response_model=CommitTeamsResponse, tags=["games/teams"])
+def commit_teams_for_game(game_id: str, body: CommitTeamsRequest):
+    """Grava a divisão escolhida em um preview (mesma lista, times por nome)."""
+    parsed_players = get_game_team_service().parse_jogadores_raw_cached(body.jogadores_raw)
+    by_name = {p.name: p for p in parsed_players if not p.is_goalkeeper}
+
+    teams = {}
+    for team, team_names in body.teams.items():
+        for name in team_names:
+            player = by_name.get(normalize_name(name))
+            if player is None:
+                raise HTTPException(status_code=400, detail=f"Jogador fora da lista: {name}")
+            player.team = team
+            teams.setdefault(team, []).append(player)
+
+    try:
+        _save_roster(game_id, parsed_players)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"game_id": game_id, "teams": teams}
+
+
+@app.get("/jobs/{job_id}", tags=["jobs"])
+def get_job(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+# -------------------------------------------------------------------
+#  /export
+#  Exportação em streaming (NDJSON ou CSV), lida do banco página a página.
+# -------------------------------------------------------------------
+@app.get("/export/games", tags=["export"])
+def export_games(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    games = get_game_service().iter_games(date_from, date_to)
+    return export_response("games", games, GAME_FIELDS, format)
+
+
+@app.get("/export/game_players", tags=["export"])
+def export_game_players(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    rows = get_game_player_service().iter_game_players(date_from, date_to)
+    return export_response("game_players", rows, EXPORT_FIELDS, format)
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Cache em memória com limite de tamanho (LRU) e expiração por TTL.
+
+    Vive enquanto o container do Lambda estiver vivo, então é compartilhado
+    entre invocações. Seguro para uso a partir do threadpool do FastAPI.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Remove todas as entradas em que predicate(key, value) é verdadeiro."""
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """
+    Cache read-through das leituras dos serviços, com chaves por entidade
+    (tuplas cujo primeiro item é o namespace, ex.: ("game", game_id)).
+
+    As escritas invalidam só as chaves afetadas (invalidate / invalidate_where).
+    Um contador de geração impede que uma leitura iniciada antes de uma escrita
+    grave o resultado antigo depois da invalidação.
+
+    A invalidação só alcança o próprio container. Quem tem a versão atual do
+    recurso (ex.: games.updated_at nos GET condicionais) passa version: a entrada
+    guardada com outra versão (escrita feita em outro container) é recarregada.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any], version: str | None = None) -> Any:
+        value = self._lookup(key, version)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        return self._store(key, loader(), generation, version)
+
+    async def aget_or_load(self, key: tuple, loader: Callable[[], Any], version: str | None = None) -> Any:
+        value = self._lookup(key, version)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        return self._store(key, await loader(), generation, version)
+
+    def invalidate(self, *keys: tuple) -> None:
+        self._generation += 1
+        for key in keys:
+            self._cache.pop(key)
+
+    def invalidate_where(self, namespace: str, predicate: Callable[[tuple, Any], bool] | None = None) -> int:
+        """Remove as chaves do namespace (todas, ou as em que predicate(key, value) é verdadeiro)."""
+        self._generation += 1
+        return self._cache.pop_where(
+            lambda key, entry: key[0] == namespace and (predicate is None or predicate(key, entry[1]))
+        )
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "namespaces": self._stats}
+
+    def _lookup(self, key: tuple, version: str | None = None) -> Any:
+        # entradas são (versão, valor); versão diferente da pedida conta como miss
+        entry = self._cache.get(key, _MISSING)
+        value = _MISSING
+        if entry is not _MISSING and (version is None or entry[0] == version):
+            value = entry[1]
+        counters = self._stats.setdefault(key[0], {"hits": 0, "misses": 0})
+        counters["hits" if value is not _MISSING else "misses"] += 1
+        return value
+
+    def _store(self, key: tuple, value: Any, generation: int, version: str | None = None) -> Any:
+        # não guarda "não encontrado" nem resultados de leituras atropeladas por escrita
+        if value is not None and generation == self._generation:
+            self._cache.set(key, (version, value))
+        return value
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.environ.get("RESPONSE_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("RESPONSE_CACHE_TTL", 30)),
+)
+
+
+# -------------------------------------------------------------------
+# Invalidação por entidade. Namespaces do response_cache:
+#   ("game", game_id)           GET /games/{game_id}
+#   ("game_players", game_id)   GET /games/{game_id}/players
+#   ("game_snapshot", game_id)  GET /games/{game_id}/snapshot
+#   ("games", ...params)        GET /games
+#   ("players", ...params)      GET /players
+#   ("player_games", player_id) GET /players/{player_id}/games
+#   ("player_stats", player_id) GET /players/{player_id}/stats
+#   ("player_ids", raw_key)     nomes resolvidos do preview de POST /games/{game_id}/teams/generate
+#   ("player_ratings", ids)     PlayerService.get_ratings
+# -------------------------------------------------------------------
+def invalidate_game(game_id: str) -> None:
+    """
+    Escrita no jogo ou no seu elenco: muda o jogo, o elenco, os totais das listas e
+    os jogos dos jogadores. As estatísticas de todos podem mudar (a sequência atual
+    depende do último jogo), então player_stats é limpo inteiro.
+    """
+    response_cache.invalidate(("game", game_id), ("game_players", game_id), ("game_snapshot", game_id))
+    response_cache.invalidate_where("games")
+    response_cache.invalidate_where("player_games", lambda _, games: any(g["id"] == game_id for g in games))
+    response_cache.invalidate_where("player_stats")
+
+
+def invalidate_player_games(*player_ids: str) -> None:
+    """Jogador entrou/saiu de um jogo."""
+    response_cache.invalidate(*(("player_games", player_id) for player_id in player_ids))
+
+
+def invalidate_players() -> None:
+    """Jogador criado ou removido: muda as listas de jogadores e a resolução de nomes do preview."""
+    response_cache.invalidate_where("players")
+    response_cache.invalidate_where("player_ids")
+    response_cache.invalidate_where("player_ratings")
+
+
+def invalidate_player(player_id: str) -> None:
+    """Jogador removido: some das listas e dos elencos em que aparecia."""
+
+    def in_roster(_, roster) -> bool:
+        return any(
+            (row.get("player") or {}).get("id") == player_id
+            or (row.get("player_invited") or {}).get("id") == player_id
+            for row in roster
+        )
+
+    invalidate_players()
+    invalidate_player_games(player_id)
+    response_cache.invalidate(("player_stats", player_id))
+    response_cache.invalidate_where("game_players", in_roster)
+    response_cache.invalidate_where("game_snapshot", lambda _, game: in_roster(_, game["players"]))
@@ -0,0 +1,47 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+def version_headers(resource: str, version: str) -> dict[str, str]:
+    """
+    Cabeçalhos de validação (ETag / Last-Modified) para um recurso cuja versão é
+    um timestamp ISO (ex.: games.updated_at).
+    """
+    etag = hashlib.sha1(f"{resource}:{version}".encode()).hexdigest()[:20]
+    headers = {"ETag": f'W/"{etag}"', "Cache-Control": "no-cache"}
+
+    modified = _parse_timestamp(version)
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request_headers, headers: dict[str, str]) -> bool:
+    """Verdadeiro se If-None-Match / If-Modified-Since da requisição batem com a versão atual."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match tem precedência sobre If-Modified-Since (RFC 9110)
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or headers["ETag"].removeprefix("W/") in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(headers["Last-Modified"]) <= since
+
+    return False
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    # games.updated_at é "timestamp without time zone" gravado em UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
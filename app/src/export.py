@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# junta as linhas em blocos deste tamanho antes de mandar para o cliente
+CHUNK_SIZE = 16 * 1024
+
+
+def ndjson_lines(records: Iterable[dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+
+def csv_lines(records: Iterable[dict], fields: Iterable[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(fields), extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def chunked(lines: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    parts = []
+    length = 0
+    for line in lines:
+        parts.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(parts).encode()
+            parts = []
+            length = 0
+    if parts:
+        yield "".join(parts).encode()
+
+
+def export_response(name: str, records: Iterable[dict], fields: Iterable[str], format: str) -> StreamingResponse:
+    """
+    Resposta em streaming de records (um registro por linha) em NDJSON ou CSV.
+
+    records deve ser um gerador (ex.: GameService.iter_games): as páginas são
+    lidas do banco enquanto a resposta é enviada, então a memória não cresce
+    com o tamanho do histórico.
+
+    Parameters:
+        name(str): Nome do arquivo (sem extensão).
+        records(Iterable[dict]): Registros a exportar.
+        fields(Iterable[str]): Colunas do CSV, na ordem.
+        format(str): "ndjson" ou "csv".
+    """
+    lines = csv_lines(records, fields) if format == "csv" else ndjson_lines(records)
+    return StreamingResponse(
+        chunked(lines),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
@@ -0,0 +1,121 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import Response
+from src.cache import TTLCache
+from src.repositories import AsyncIdempotencyRepository
+
+IDEMPOTENCY_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+IDEMPOTENCY_TTL = float(os.environ.get("IDEMPOTENCY_TTL", 24 * 60 * 60))
+# tempo máximo de uma requisição em andamento (acima do timeout do Lambda): depois
+# disso uma chave sem resposta é de uma requisição que morreu e pode ser repetida
+IDEMPOTENCY_LEASE = float(os.environ.get("IDEMPOTENCY_LEASE", 60))
+
+
+class IdempotencyConflict(Exception):
+    """Chave em uso por outra requisição (em andamento ou com outro corpo)."""
+
+    def __init__(self, detail: str, status_code: int = 409):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+@dataclass(slots=True)
+class StoredResponse:
+    status_code: int
+    body: bytes
+    content_type: str | None
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=self.content_type,
+            headers={"Idempotency-Replayed": "true"},
+        )
+
+
+class IdempotencyStore:
+    """
+    Respostas das escritas por Idempotency-Key: um TTLCache em memória na frente
+    da tabela idempotency_keys (compartilhada entre os containers do Lambda).
+
+    begin reserva a chave antes de executar o endpoint; complete guarda a
+    resposta; abort libera a chave quando a requisição falha, para o cliente
+    poder repetir. Se o processo morre antes do abort, a reserva vale só por
+    lease segundos (locked_at).
+    """
+
+    def __init__(
+        self,
+        repository: AsyncIdempotencyRepository | None = None,
+        ttl: float = IDEMPOTENCY_TTL,
+        lease: float = IDEMPOTENCY_LEASE,
+    ):
+        self.repository = repository or AsyncIdempotencyRepository()
+        self.ttl = ttl
+        self.lease = lease
+        self.cache = TTLCache(maxsize=int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", 256)), ttl=ttl)
+
+    async def begin(self, key: str, request_hash: str) -> StoredResponse | None:
+        """
+        Returns:
+            StoredResponse | None: A resposta guardada (repetição) ou None se a
+            chave foi reservada agora e o endpoint deve ser executado.
+
+        Raises:
+            IdempotencyConflict: A chave está em andamento (409) ou foi usada com
+            outro corpo (422).
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            stored_hash, stored = cached
+            self._check_hash(stored_hash, request_hash)
+            return stored
+
+        if await self.repository.reserve(key, request_hash):
+            return None
+
+        row = await self.repository.get(key)
+        if row is not None and self._expired(row):
+            await self.repository.delete(key)
+            if await self.repository.reserve(key, request_hash):
+                return None
+            row = await self.repository.get(key)
+        if row is None:
+            raise IdempotencyConflict("Requisição com esta Idempotency-Key em andamento")
+
+        self._check_hash(row["request_hash"], request_hash)
+        if row["status_code"] is None:
+            if self._lease_expired(row) and await self.repository.take_over(key, self._cutoff(self.lease)):
+                return None
+            raise IdempotencyConflict("Requisição com esta Idempotency-Key em andamento")
+
+        stored = StoredResponse(row["status_code"], (row["response_body"] or "").encode(), row["content_type"])
+        self.cache.set(key, (row["request_hash"], stored))
+        return stored
+
+    async def complete(self, key: str, request_hash: str, response: StoredResponse) -> None:
+        self.cache.set(key, (request_hash, response))
+        await self.repository.complete(key, response.status_code, response.body.decode(), response.content_type)
+
+    async def abort(self, key: str) -> None:
+        await self.repository.delete(key)
+
+    @staticmethod
+    def _check_hash(stored_hash: str, request_hash: str) -> None:
+        if stored_hash != request_hash:
+            raise IdempotencyConflict("Idempotency-Key já usada com outro corpo de requisição", status_code=422)
+
+    def _expired(self, row: dict) -> bool:
+        created_at = datetime.fromisoformat(row["created_at"])
+        return created_at < datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+
+    def _lease_expired(self, row: dict) -> bool:
+        locked_at = datetime.fromisoformat(row.get("locked_at") or row["created_at"])
+        return locked_at < datetime.now(timezone.utc) - timedelta(seconds=self.lease)
+
+    @staticmethod
+    def _cutoff(seconds: float) -> str:
+        return (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
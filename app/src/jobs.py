@@ -0,0 +1,185 @@
+import os
+import queue
+import threading
+import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from src.repositories import JobRepository
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+# outro job com a mesma chave chegou antes deste rodar: só o mais recente grava
+SUPERSEDED = "superseded"
+
+# tempo máximo de uma execução (acima do timeout do Lambda): depois disso um job
+# "running" é de um container que morreu ou foi congelado e pode ser assumido
+JOB_LEASE = float(os.environ.get("JOB_LEASE", 60))
+
+
+def _now(offset: float = 0.0) -> str:
+    return (datetime.now(timezone.utc) - timedelta(seconds=offset)).isoformat()
+
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    key: str
+    status: str = PENDING
+    result: Any = None
+    error: str | None = None
+    created_at: str | None = None
+    finished_at: str | None = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Job":
+        return cls(
+            id=row["id"],
+            key=row["key"],
+            status=row["status"],
+            result=row.get("result"),
+            error=row.get("error"),
+            created_at=row.get("created_at"),
+            finished_at=row.get("finished_at"),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class InlineJobQueue:
+    """
+    Fila de jobs persistida na tabela jobs: o payload e o status ficam no banco,
+    então qualquer container responde GET /jobs/{job_id} e termina um job que
+    ficou para trás (o Lambda congela o container depois da resposta e pode
+    descartá-lo).
+
+    Esta variante não tem thread: os jobs rodam em drain() ou quando alguém
+    consulta o status (get). Serve para rodar e testar offline (JOB_QUEUE=inline).
+
+    Parameters:
+        handlers(dict[str, Callable[[dict], Any]]): Função de cada kind; recebe o
+            payload e devolve o resultado (serializável em JSON).
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Callable[[dict], Any]],
+        repository: JobRepository | None = None,
+        lease: float = JOB_LEASE,
+    ):
+        self.handlers = handlers
+        self.repository = repository or JobRepository()
+        self.lease = lease
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, key: str, payload: dict) -> Job:
+        """
+        Grava o job e agenda a execução. Jobs ainda pendentes com a mesma key (ex.:
+        o mesmo jogo gerado de novo) são descartados: só a versão mais recente grava.
+
+        Raises:
+            RuntimeError: O insert em jobs não devolveu a linha (o job não existe).
+        """
+        row = self.repository.create(key, kind, payload)
+        if row is None:
+            raise RuntimeError(f"Não foi possível gravar o job {kind} ({key})")
+        self.repository.supersede(key, row["created_at"], _now())
+        self._enqueue(row["id"])
+        return Job.from_row(row)
+
+    def get(self, job_id: str) -> Job | None:
+        """Status do job; se ele ainda não rodou (ou a execução foi abandonada), roda agora."""
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return None
+        row = self.repository.get(job_id)
+        if row is None:
+            return None
+        if row["status"] in (PENDING, RUNNING) and self._run(job_id):
+            row = self.repository.get(job_id)
+        return Job.from_row(row)
+
+    def drain(self) -> int:
+        """Executa os jobs agendados por esta fila. Retorna quantos rodaram."""
+        with self._lock:
+            job_ids, self._pending = self._pending, []
+        return sum(1 for job_id in job_ids if self._run(job_id))
+
+    def _enqueue(self, job_id: str) -> None:
+        with self._lock:
+            self._pending.append(job_id)
+
+    def _run(self, job_id: str) -> bool:
+        """Assume o job (pendente, ou em execução há mais que lease) e executa. False se não assumiu."""
+        row = self.repository.claim(job_id, PENDING, _now())
+        if row is None:
+            row = self.repository.claim(job_id, RUNNING, _now(), locked_before=_now(self.lease))
+        if row is None:
+            return False
+
+        if self.repository.has_newer(row["key"], row["created_at"]):
+            self.repository.finish(job_id, SUPERSEDED, _now())
+            return True
+        try:
+            result = self.handlers[row["kind"]](row["payload"])
+        except Exception as exc:
+            traceback.print_exc()
+            self.repository.finish(job_id, ERROR, _now(), error=str(exc))
+        else:
+            self.repository.finish(job_id, DONE, _now(), result=result)
+        return True
+
+
+class ThreadJobQueue(InlineJobQueue):
+    """
+    Fila com uma thread de trabalho: o endpoint responde e a escrita roda em
+    seguida, fora do caminho da requisição.
+
+    No Lambda a thread fica congelada entre invocações. Um job interrompido
+    continua no banco e é terminado por quem consultar GET /jobs/{job_id}
+    (na hora, se nunca começou; depois do lease, se ficou em execução).
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Callable[[dict], Any]],
+        repository: JobRepository | None = None,
+        lease: float = JOB_LEASE,
+    ):
+        super().__init__(handlers, repository, lease)
+        self._queue: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._work, name="job-queue", daemon=True)
+        self._worker.start()
+
+    def _enqueue(self, job_id: str) -> None:
+        self._queue.put(job_id)
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception:
+                # erro ao falar com o banco: o job fica para o próximo GET /jobs/{job_id}
+                traceback.print_exc()
+
+
+def create_job_queue(handlers: dict[str, Callable[[dict], Any]]) -> InlineJobQueue:
+    """JOB_QUEUE=thread (padrão) ou inline."""
+    if os.environ.get("JOB_QUEUE", "thread").lower() == "inline":
+        return InlineJobQueue(handlers)
+    return ThreadJobQueue(handlers)
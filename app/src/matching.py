@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from src.utils import normalize_name
+
+
+@dataclass(slots=True)
+class NameMatch:
+    key: str  # nome normalizado (ou apelido) que casou
+    player_id: str
+    score: float
+    kind: str  # "exact", "alias", "fuzzy" ou "abbreviation"
+
+
+def trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def is_abbreviation(query: str, key: str) -> bool:
+    """
+    True se query abrevia key: "joao p" -> "joao paulo" (cada palavra é prefixo
+    da palavra correspondente) ou "jp" -> "joao paulo" (iniciais).
+    """
+    q_tokens = query.split()
+    k_tokens = key.split()
+    if len(k_tokens) < 2:
+        return False
+    if len(q_tokens) == len(k_tokens):
+        return q_tokens != k_tokens and all(k.startswith(q) for q, k in zip(q_tokens, k_tokens))
+    if len(q_tokens) == 1 and len(query) == len(k_tokens):
+        return all(k[0] == c for c, k in zip(query, k_tokens))
+    return False
+
+
+class NameIndex:
+    """
+    Índice em memória dos nomes normalizados dos jogadores para achar grafias
+    parecidas ("joao paulo", "joao p", "jp").
+
+    Um índice invertido de trigramas seleciona os candidatos e a similaridade
+    é o coeficiente de Dice entre os trigramas. Apelidos confirmados entram
+    como chaves exatas. Seguro para uso a partir do threadpool do FastAPI.
+    """
+
+    def __init__(self, threshold: float = 0.8, margin: float = 0.05, ttl: float = 600.0):
+        self.threshold = threshold
+        self.margin = margin
+        self.ttl = ttl
+        self._loaded_at: float | None = None
+        self._ids: dict[str, str] = {}  # chave -> player_id
+        self._aliases: set[str] = set()
+        self._grams: dict[str, set[str]] = {}
+        self._postings: defaultdict[str, set[str]] = defaultdict(set)
+        self._by_initial: defaultdict[str, set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def load(self, players: list[dict], aliases: list[dict] | None = None) -> None:
+        """
+        Reconstrói o índice.
+
+        Parameters:
+            players(list[dict]): Linhas com id e name (ou name_normalized).
+            aliases(list[dict] | None): Linhas de player_aliases (alias_normalized, player_id).
+        """
+        with self._lock:
+            self._ids.clear()
+            self._aliases.clear()
+            self._grams.clear()
+            self._postings.clear()
+            self._by_initial.clear()
+            for player in players:
+                self._add(player.get("name_normalized") or normalize_name(player["name"]), player["id"])
+            for alias in aliases or []:
+                self._add(alias["alias_normalized"], alias["player_id"], alias=True)
+            self._loaded_at = time.monotonic()
+
+    @property
+    def stale(self) -> bool:
+        """True se o índice nunca foi carregado ou passou do TTL (outros containers criam/apagam jogadores)."""
+        return self._loaded_at is None or time.monotonic() > self._loaded_at + self.ttl
+
+    def add(self, name: str, player_id: str, alias: bool = False) -> None:
+        with self._lock:
+            self._add(normalize_name(name), player_id, alias)
+
+    def _add(self, key: str, player_id: str, alias: bool = False) -> None:
+        if not key:
+            return
+        if key in self._ids:
+            self._discard(key)
+        grams = trigrams(key)
+        self._ids[key] = player_id
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings[gram].add(key)
+        self._by_initial[key[0]].add(key)
+        if alias:
+            self._aliases.add(key)
+
+    def _discard(self, key: str) -> None:
+        for gram in self._grams.pop(key, ()):
+            self._postings[gram].discard(key)
+        self._by_initial[key[0]].discard(key)
+        self._aliases.discard(key)
+        del self._ids[key]
+
+    def remove_player(self, player_id: str) -> None:
+        """Remove o jogador e todos os apelidos dele."""
+        with self._lock:
+            for key in [k for k, pid in self._ids.items() if pid == player_id]:
+                self._discard(key)
+
+    def lookup(self, name: str) -> NameMatch | None:
+        """O jogador com exatamente esse nome normalizado ou apelido confirmado, ou None."""
+        key = normalize_name(name)
+        with self._lock:
+            player_id = self._ids.get(key)
+            if player_id is None:
+                return None
+            return NameMatch(key, player_id, 1.0, "alias" if key in self._aliases else "exact")
+
+    def candidates(self, name: str, limit: int = 5) -> list[NameMatch]:
+        """Os nomes mais parecidos com name, do maior score para o menor (sem aplicar o threshold)."""
+        query = normalize_name(name)
+        if not query:
+            return []
+        with self._lock:
+            if query in self._ids:
+                kind = "alias" if query in self._aliases else "exact"
+                return [NameMatch(query, self._ids[query], 1.0, kind)]
+
+            q_grams = trigrams(query)
+            shared = Counter(key for gram in q_grams for key in self._postings.get(gram, ()))
+            matches = [
+                NameMatch(key, self._ids[key], 2 * count / (len(q_grams) + len(self._grams[key])), "fuzzy")
+                for key, count in shared.items()
+            ]
+            abbreviations = [
+                NameMatch(key, self._ids[key], 2 * shared[key] / (len(q_grams) + len(self._grams[key])), "abbreviation")
+                for key in self._by_initial.get(query[0], ())
+                if is_abbreviation(query, key)
+            ]
+
+        matches.sort(key=lambda m: m.score, reverse=True)
+        if len(abbreviations) == 1:
+            matches = abbreviations + [m for m in matches if m.key != abbreviations[0].key]
+        return matches[:limit]
+
+    def match(self, name: str) -> NameMatch | None:
+        """
+        O jogador correspondente a name, ou None.
+
+        Uma abreviação só vale se for única. Um match por similaridade precisa
+        atingir o threshold e ficar à frente (por margin) de qualquer outro
+        jogador, para não juntar pessoas diferentes com nomes parecidos.
+        """
+        found = self.candidates(name, limit=2)
+        if not found:
+            return None
+        best = found[0]
+        if best.kind != "fuzzy":
+            return best
+        if best.score < self.threshold:
+            return None
+        if len(found) > 1 and found[1].player_id != best.player_id and best.score - found[1].score < self.margin:
+            return None
+        return best
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._ids),
+            "aliases": len(self._aliases),
+            "threshold": self.threshold,
+            "stale": self.stale,
+        }
+
+    def __len__(self) -> int:
+        return len(self._ids)
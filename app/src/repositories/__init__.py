@@ -3,8 +3,31 @@ import os
 SUPABASE_URL: str = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY: str = os.environ.get("SUPABASE_KEY")
 
+from .async_game_player_repository import AsyncGamePlayerRepository
+from .async_game_repository import AsyncGameRepository
+from .async_idempotency_repository import AsyncIdempotencyRepository
+from .async_player_alias_repository import AsyncPlayerAliasRepository
+from .async_player_repository import AsyncPlayerRepository
+from .client import get_async_client, get_client
 from .game_player_repository import GamePlayerRepository
 from .game_repository import GameRepository
+from .job_repository import JobRepository
+from .player_alias_repository import PlayerAliasRepository
 from .player_repository import PlayerRepository
+from .player_stats_repository import PlayerStatsRepository
 
-__all__ = ["PlayerRepository", "GamePlayerRepository", "GameRepository"]
+__all__ = [
+    "get_client",
+    "get_async_client",
+    "PlayerRepository",
+    "PlayerAliasRepository",
+    "PlayerStatsRepository",
+    "GamePlayerRepository",
+    "GameRepository",
+    "JobRepository",
+    "AsyncPlayerRepository",
+    "AsyncPlayerAliasRepository",
+    "AsyncGamePlayerRepository",
+    "AsyncGameRepository",
+    "AsyncIdempotencyRepository",
+]
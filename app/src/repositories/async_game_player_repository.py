@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_async_client
+from src.repositories.filters import apply_filters
+from src.repositories.game_player_repository import ROSTER_COLUMNS
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncGamePlayerRepository:
+    """Variante assíncrona de GamePlayerRepository."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self._supabase = client
+
+    async def supabase(self) -> "AsyncClient":
+        if self._supabase is None:
+            self._supabase = await get_async_client()
+        return self._supabase
+
+    async def get(self, filters: dict | None = None, columns: str = "*") -> list[dict] | None:
+        query = (await self.supabase()).table("game_players").select(columns)
+        query = apply_filters(query, filters)
+
+        response = await query.execute()
+        return response.data or None
+
+    async def get_players(self, game_id: str) -> list[dict] | None:
+        response = await (
+            (await self.supabase())
+            .table("game_players")
+            .select(ROSTER_COLUMNS)
+            .eq("game_id", game_id)
+            .execute()
+        )
+        if response.data:
+            return response.data
+        return None
+
+    async def upsert(self, data) -> dict | None:
+        resp = await (
+            (await self.supabase())
+            .table("game_players")
+            .upsert(data, on_conflict="game_id,player_id")
+            .execute()
+        )
+
+        if not resp.data:
+            return None
+
+        return resp.data[0]
+
+    async def upsert_many(self, rows: list[dict]) -> list[dict]:
+        if not rows:
+            return []
+
+        resp = await (
+            (await self.supabase())
+            .table("game_players")
+            .upsert(rows, on_conflict="game_id,player_id")
+            .execute()
+        )
+        return resp.data or []
+
+    async def update(self, game_id, player_id, body):
+        response = await (
+            (await self.supabase())
+            .table("game_players")
+            .update(body)
+            .eq("game_id", game_id)
+            .eq("player_id", player_id)
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return
+
+    async def get_with_pricing(self, game_id: str, player_id: str) -> dict | None:
+        """Linha do jogador no jogo com os campos de preço do jogo embutidos (uma ida ao banco)."""
+        response = await (
+            (await self.supabase())
+            .table("game_players")
+            .select("*, game:game_id (price_per_player, goalkeepers_pay)")
+            .eq("game_id", game_id)
+            .eq("player_id", player_id)
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return None
+
+    async def update_with_rules(self, game_id: str, player_id: str, body: dict) -> dict | None:
+        """
+        Aplica as regras de preço e a atualização de forma atômica na função
+        update_game_player (database_scripts/function_update_game_player.sql).
+        """
+        params = {"p_game": game_id, "p_player": player_id, **{f"p_{k}": v for k, v in body.items()}}
+        response = await (await self.supabase()).rpc("update_game_player", params).execute()
+        if response.data:
+            return response.data[0]
+        return None
@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_async_client
+from src.repositories.filters import apply_filters
+from src.repositories.game_player_repository import ROSTER_COLUMNS
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncGameRepository:
+    """Variante assíncrona de GameRepository."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self._supabase = client
+
+    async def supabase(self) -> "AsyncClient":
+        if self._supabase is None:
+            self._supabase = await get_async_client()
+        return self._supabase
+
+    async def get(self, filters: dict | None = None, columns: str = "*") -> list[dict] | None:
+        query = (await self.supabase()).table("games").select(columns)
+        query = apply_filters(query, filters)
+
+        # order
+        query = query.order("game_date", desc=True)
+
+        response = await query.execute()
+        return response.data or None
+
+    async def get_snapshot(self, game_id: str) -> dict | None:
+        """Jogo + elenco (com jogador e convidador) em um único select embutido."""
+        response = await (
+            (await self.supabase())
+            .table("games")
+            .select(f"*, game_players ({ROSTER_COLUMNS})")
+            .eq("id", game_id)
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return None
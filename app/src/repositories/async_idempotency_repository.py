@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_async_client
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncIdempotencyRepository:
+    """Respostas guardadas por Idempotency-Key (tabela idempotency_keys)."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self._supabase = client
+
+    async def supabase(self) -> "AsyncClient":
+        if self._supabase is None:
+            self._supabase = await get_async_client()
+        return self._supabase
+
+    async def reserve(self, key: str, request_hash: str) -> bool:
+        """
+        Marca a chave como em andamento (INSERT ... ON CONFLICT DO NOTHING).
+
+        Returns:
+            bool: True se a chave era nova; False se já existia.
+        """
+        response = await (
+            (await self.supabase())
+            .table("idempotency_keys")
+            .upsert({"key": key, "request_hash": request_hash}, on_conflict="key", ignore_duplicates=True)
+            .execute()
+        )
+        return bool(response.data)
+
+    async def take_over(self, key: str, locked_before: str) -> bool:
+        """
+        Assume uma chave sem resposta cuja tentativa começou antes de locked_before
+        (a requisição que a reservou morreu, ex.: timeout do Lambda). O UPDATE
+        condicional garante que só uma repetição assume.
+
+        Returns:
+            bool: True se a chave foi assumida por esta requisição.
+        """
+        response = await (
+            (await self.supabase())
+            .table("idempotency_keys")
+            .update({"locked_at": datetime.now(timezone.utc).isoformat()})
+            .eq("key", key)
+            .is_("status_code", "null")
+            .lt("locked_at", locked_before)
+            .execute()
+        )
+        return bool(response.data)
+
+    async def get(self, key: str) -> dict | None:
+        response = await (await self.supabase()).table("idempotency_keys").select("*").eq("key", key).execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    async def complete(self, key: str, status_code: int, body: str, content_type: str | None) -> None:
+        await (
+            (await self.supabase())
+            .table("idempotency_keys")
+            .update({"status_code": status_code, "response_body": body, "content_type": content_type})
+            .eq("key", key)
+            .execute()
+        )
+        return None
+
+    async def delete(self, key: str) -> None:
+        await (await self.supabase()).table("idempotency_keys").delete().eq("key", key).execute()
+        return None
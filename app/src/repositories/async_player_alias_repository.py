@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_async_client
+from src.repositories.filters import apply_filters
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncPlayerAliasRepository:
+    """Variante assíncrona de PlayerAliasRepository."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self._supabase = client
+
+    async def supabase(self) -> "AsyncClient":
+        if self._supabase is None:
+            self._supabase = await get_async_client()
+        return self._supabase
+
+    async def upsert(self, alias_normalized: str, player_id: str) -> dict | None:
+        """Cria o apelido ou aponta um apelido existente para outro jogador."""
+        response = await (
+            (await self.supabase())
+            .table("player_aliases")
+            .upsert({"alias_normalized": alias_normalized, "player_id": player_id}, on_conflict="alias_normalized")
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return None
+
+    async def get(self, filters: dict | None = None) -> list[dict] | None:
+        query = (await self.supabase()).table("player_aliases").select("alias_normalized, player_id")
+        query = apply_filters(query, filters)
+        response = await query.execute()
+        return response.data or None
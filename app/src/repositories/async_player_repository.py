@@ -0,0 +1,48 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_async_client
+from src.repositories.filters import apply_filters
+from src.repositories.player_repository import with_name_key
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncPlayerRepository:
+    """Variante assíncrona de PlayerRepository."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self._supabase = client
+
+    async def supabase(self) -> "AsyncClient":
+        if self._supabase is None:
+            self._supabase = await get_async_client()
+        return self._supabase
+
+    async def create(self, body: dict) -> dict | None:
+        response = await (await self.supabase()).table("players").insert(with_name_key(body)).execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    async def create_missing(self, bodies: list[dict]) -> list[dict]:
+        """Ver PlayerRepository.create_missing."""
+        if not bodies:
+            return []
+        response = await (
+            (await self.supabase())
+            .table("players")
+            .upsert([with_name_key(body) for body in bodies], on_conflict="name_normalized", ignore_duplicates=True)
+            .execute()
+        )
+        return response.data or []
+
+    async def get(self, filters: dict | None = None, columns: str = "*") -> list[dict] | None:
+        query = (await self.supabase()).table("players").select(columns)
+        query = apply_filters(query, filters)
+
+        # order
+        query = query.order("name")
+
+        response = await query.execute()
+        return response.data or None
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+from src.repositories import SUPABASE_KEY, SUPABASE_URL
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient, Client
+
+# O pacote supabase (httpx, postgrest, gotrue, realtime, storage...) é pesado:
+# só é importado quando o primeiro client é de fato criado.
+_client: "Client | None" = None
+_lock = threading.Lock()
+
+
+def get_client() -> "Client":
+    """
+    Retorna o client do Supabase compartilhado pelo processo.
+
+    O client é criado na primeira chamada e reaproveitado enquanto o container
+    do Lambda estiver vivo, mantendo as conexões HTTP (keep-alive) abertas
+    entre as invocações.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from supabase import create_client
+
+                _client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _client
+
+
+_async_client: "AsyncClient | None" = None
+_async_lock: asyncio.Lock | None = None
+
+
+async def get_async_client() -> "AsyncClient":
+    """Versão assíncrona de get_client(), usada pelos repositórios Async*."""
+    global _async_client, _async_lock
+    if _async_client is None:
+        if _async_lock is None:
+            _async_lock = asyncio.Lock()
+        async with _async_lock:
+            if _async_client is None:
+                from supabase import acreate_client
+
+                _async_client = await acreate_client(SUPABASE_URL, SUPABASE_KEY)
+    return _async_client
@@ -0,0 +1,33 @@
+# Operadores aceitos quando o valor de um filtro é um dict, ex.:
+# {"game_date": {"gte": "2025-01-01", "lte": "2025-12-31"}}
+OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte")
+
+
+def apply_filters(query, filters: dict | None):
+    """Aplica o dicionário de filtros genérico dos repositórios em uma query do PostgREST."""
+    if not filters:
+        return query
+
+    for field, value in filters.items():
+        if value is None:
+            continue  # ignora filtros vazios
+
+        # se vier lista/tupla, vira IN
+        if isinstance(value, (list, tuple, set)):
+            query = query.in_(field, list(value))
+        # se vier dict, cada chave é um operador (gte/lte/...)
+        elif isinstance(value, dict):
+            for op, operand in value.items():
+                if op not in OPERATORS:
+                    raise ValueError(f"Operador de filtro inválido: {op}")
+                if operand is not None:
+                    query = getattr(query, op)(field, operand)
+        else:
+            query = query.eq(field, value)
+
+    return query
+
+
+def quote(value) -> str:
+    """Escapa um valor para uso dentro de um filtro or=(...) do PostgREST."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
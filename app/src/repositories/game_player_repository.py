@@ -1,26 +1,43 @@
-import os
+from typing import TYPE_CHECKING
 
-from src.repositories import SUPABASE_KEY, SUPABASE_URL
-from supabase import Client, create_client
+from src.repositories.client import get_client
+from src.repositories.filters import apply_filters
 
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Elenco de um jogo com o jogador e o convidador embutidos
+ROSTER_COLUMNS = (
+    "id, created_at, updated_at, is_goalkeeper, is_visitor, paid, amount_paid, team, "
+    "player:player_id (*), player_invited:invited_by (*)"
+)
 
-class GamePlayerRepository:
-    def __init__(self):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-    def get(self, filters: dict | None = None) -> list[dict] | None:
-        query = self.supabase.table("game_players").select("*")
+class GamePlayerRepository:
+    def __init__(self, client: "Client | None" = None):
+        self.supabase: "Client" = client or get_client()
 
-        if filters:
-            for field, value in filters.items():
-                if value is None:
-                    continue  # ignora filtros vazios
+    def get(
+        self,
+        filters: dict | None = None,
+        columns: str = "*",
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> list[dict] | None:
+        """
+        Parameters:
+            filters(dict | None): Filtros genéricos (ver apply_filters).
+            columns(str): Colunas do select (precisa de id quando paginado).
+            limit(int | None): Tamanho máximo da página; pagina em ordem de id.
+            after(str | None): Cursor (keyset): id do último item da página anterior.
+        """
+        query = self.supabase.table("game_players").select(columns)
+        query = apply_filters(query, filters)
 
-                # se vier lista/tupla, vira IN
-                if isinstance(value, (list, tuple, set)):
-                    query = query.in_(field, list(value))
-                else:
-                    query = query.eq(field, value)
+        if limit is not None:
+            if after is not None:
+                query = query.gt("id", after)
+            query = query.order("id").limit(limit)
 
         response = query.execute()
         return response.data or None
@@ -39,9 +56,7 @@ class GamePlayerRepository:
     def get_players(self, game_id: str) -> list[dict] | None:
         response = (
             self.supabase.table("game_players")
-            .select(
-                "id, created_at, updated_at, is_goalkeeper, is_visitor, paid, amount_paid, team, player:player_id (*), player_invited:invited_by (*)"
-            )
+            .select(ROSTER_COLUMNS)
             .eq("game_id", game_id)
             .execute()
         )
@@ -61,6 +76,17 @@ class GamePlayerRepository:
 
         return resp.data[0]
 
+    def upsert_many(self, rows: list[dict]) -> list[dict]:
+        if not rows:
+            return []
+
+        resp = (
+            self.supabase.table("game_players")
+            .upsert(rows, on_conflict="game_id,player_id")
+            .execute()
+        )
+        return resp.data or []
+
     def delete(self, game_id: str, player_id: str):
         response = (
             self.supabase.table("game_players")
@@ -1,10 +1,15 @@
-from src.repositories import SUPABASE_KEY, SUPABASE_URL
-from supabase import Client, create_client
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_client
+from src.repositories.filters import apply_filters
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class GameRepository:
-    def __init__(self):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    def __init__(self, client: "Client | None" = None):
+        self.supabase: "Client" = client or get_client()
 
     def create(self, body: dict) -> dict | None:
         """Create new game in Supabase"""
@@ -13,6 +18,23 @@ class GameRepository:
             return response.data[0]
         return None
 
+    def create_if_absent(self, body: dict) -> dict | None:
+        """
+        Cria o jogo em um único request, sem duplicar a data
+        (ON CONFLICT (game_date) DO NOTHING).
+
+        Returns:
+            dict | None: O jogo criado, ou None se já existia um jogo nessa data.
+        """
+        response = (
+            self.supabase.table("games")
+            .upsert(body, on_conflict="game_date", ignore_duplicates=True)
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return None
+
     def update(self, game_id: str, body: dict) -> dict | None:
         """Update data in Supabase"""
         response = self.supabase.table("games").update(body).eq("id", game_id).execute()
@@ -20,22 +42,36 @@ class GameRepository:
             return response.data[0]
         return None
 
-    def get(self, filters: dict | None = None) -> list[dict] | None:
-        query = self.supabase.table("games").select("*")
+    def get(
+        self,
+        filters: dict | None = None,
+        columns: str = "*",
+        limit: int | None = None,
+        after: str | None = None,
+        descending: bool = True,
+    ) -> list[dict] | None:
+        """
+        Lista jogos do mais recente para o mais antigo (ou o contrário com descending=False).
 
-        if filters:
-            for field, value in filters.items():
-                if value is None:
-                    continue  # ignora filtros vazios
+        Parameters:
+            filters(dict | None): Filtros genéricos (ver apply_filters).
+            columns(str): Colunas do select.
+            limit(int | None): Tamanho máximo da página.
+            after(str | None): Cursor (keyset): game_date do último item da página anterior.
+            descending(bool): Ordem de game_date.
+        """
+        query = self.supabase.table("games").select(columns)
+        query = apply_filters(query, filters)
 
-                # se vier lista/tupla, vira IN
-                if isinstance(value, (list, tuple, set)):
-                    query = query.in_(field, list(value))
-                else:
-                    query = query.eq(field, value)
+        # keyset: game_date é único, então basta continuar depois dele
+        if after is not None:
+            query = query.lt("game_date", after) if descending else query.gt("game_date", after)
 
         # order
-        query = query.order("game_date", desc=True)
+        query = query.order("game_date", desc=descending)
+
+        if limit is not None:
+            query = query.limit(limit)
 
         response = query.execute()
         return response.data or None
@@ -0,0 +1,79 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_client
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+class JobRepository:
+    """Jobs das escritas adiadas (tabela jobs)."""
+
+    def __init__(self, client: "Client | None" = None):
+        self.supabase: "Client" = client or get_client()
+
+    def create(self, key: str, kind: str, payload: dict) -> dict | None:
+        response = (
+            self.supabase.table("jobs")
+            .insert({"key": key, "kind": kind, "payload": payload, "status": "pending"})
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return None
+
+    def get(self, job_id: str) -> dict | None:
+        response = self.supabase.table("jobs").select("*").eq("id", job_id).execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    def supersede(self, key: str, created_before: str, finished_at: str) -> None:
+        """Descarta os jobs pendentes da mesma chave criados antes de created_before."""
+        (
+            self.supabase.table("jobs")
+            .update({"status": "superseded", "finished_at": finished_at})
+            .eq("key", key)
+            .eq("status", "pending")
+            .lt("created_at", created_before)
+            .execute()
+        )
+        return None
+
+    def has_newer(self, key: str, created_at: str) -> bool:
+        response = (
+            self.supabase.table("jobs")
+            .select("id")
+            .eq("key", key)
+            .gt("created_at", created_at)
+            .limit(1)
+            .execute()
+        )
+        return bool(response.data)
+
+    def claim(self, job_id: str, status: str, locked_at: str, locked_before: str | None = None) -> dict | None:
+        """
+        Passa o job de status para running com um UPDATE condicional: só uma
+        execução consegue. Com locked_before, só assume se a execução anterior
+        começou antes disso (o container que rodava morreu ou foi congelado).
+
+        Returns:
+            dict | None: A linha do job, ou None se outro já assumiu.
+        """
+        query = self.supabase.table("jobs").update({"status": "running", "locked_at": locked_at})
+        query = query.eq("id", job_id).eq("status", status)
+        if locked_before is not None:
+            query = query.lt("locked_at", locked_before)
+        response = query.execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    def finish(self, job_id: str, status: str, finished_at: str, result=None, error: str | None = None) -> None:
+        (
+            self.supabase.table("jobs")
+            .update({"status": status, "result": result, "error": error, "finished_at": finished_at})
+            .eq("id", job_id)
+            .execute()
+        )
+        return None
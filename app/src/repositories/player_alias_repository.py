@@ -0,0 +1,33 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_client
+from src.repositories.filters import apply_filters
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+class PlayerAliasRepository:
+    def __init__(self, client: "Client | None" = None):
+        self.supabase: "Client" = client or get_client()
+
+    def upsert(self, alias_normalized: str, player_id: str) -> dict | None:
+        """Cria o apelido ou aponta um apelido existente para outro jogador."""
+        response = (
+            self.supabase.table("player_aliases")
+            .upsert({"alias_normalized": alias_normalized, "player_id": player_id}, on_conflict="alias_normalized")
+            .execute()
+        )
+        if response.data:
+            return response.data[0]
+        return None
+
+    def get(self, filters: dict | None = None) -> list[dict] | None:
+        query = self.supabase.table("player_aliases").select("alias_normalized, player_id")
+        query = apply_filters(query, filters)
+        response = query.execute()
+        return response.data or None
+
+    def delete(self, alias_normalized: str) -> None:
+        self.supabase.table("player_aliases").delete().eq("alias_normalized", alias_normalized).execute()
+        return None
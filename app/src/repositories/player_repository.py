@@ -1,40 +1,83 @@
-from src.repositories import SUPABASE_KEY, SUPABASE_URL
-from supabase import Client, create_client
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_client
+from src.repositories.filters import apply_filters, quote
+from src.utils import normalize_name
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+def with_name_key(body: dict) -> dict:
+    """Preenche name_normalized (chave única de players) a partir de name."""
+    if "name" in body:
+        return {**body, "name_normalized": normalize_name(body["name"])}
+    return body
 
 
 class PlayerRepository:
-    def __init__(self):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    def __init__(self, client: "Client | None" = None):
+        self.supabase: "Client" = client or get_client()
 
     def create(self, body: dict) -> dict | None:
-        response = self.supabase.table("players").insert(body).execute()
+        response = self.supabase.table("players").insert(with_name_key(body)).execute()
         if response.data:
             return response.data[0]
         return None
 
+    def create_missing(self, bodies: list[dict]) -> list[dict]:
+        """
+        Insere em um único request os jogadores cujo nome normalizado ainda não
+        existe (ON CONFLICT (name_normalized) DO NOTHING).
+
+        Returns:
+            list[dict]: Somente as linhas criadas; nomes que já existiam ficam de fora.
+        """
+        if not bodies:
+            return []
+        response = (
+            self.supabase.table("players")
+            .upsert([with_name_key(body) for body in bodies], on_conflict="name_normalized", ignore_duplicates=True)
+            .execute()
+        )
+        return response.data or []
+
     def update(self, player_id: str, body: dict) -> dict | None:
         """Update player data in Supabase"""
-        response = self.supabase.table("players").update(body).eq("id", player_id).execute()
+        response = self.supabase.table("players").update(with_name_key(body)).eq("id", player_id).execute()
         if response.data:
             return response.data[0]
         return None
 
-    def get(self, filters: dict | None = None) -> list[dict] | None:
-        query = self.supabase.table("players").select("*")
+    def get(
+        self,
+        filters: dict | None = None,
+        columns: str = "*",
+        limit: int | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> list[dict] | None:
+        """
+        Lista jogadores por nome.
 
-        if filters:
-            for field, value in filters.items():
-                if value is None:
-                    continue  # ignora filtros vazios
+        Parameters:
+            filters(dict | None): Filtros genéricos (ver apply_filters).
+            columns(str): Colunas do select.
+            limit(int | None): Tamanho máximo da página.
+            after(tuple[str, str] | None): Cursor (keyset): (name, id) do último item da página anterior.
+        """
+        query = self.supabase.table("players").select(columns)
+        query = apply_filters(query, filters)
 
-                # se vier lista/tupla, vira IN
-                if isinstance(value, (list, tuple, set)):
-                    query = query.in_(field, list(value))
-                else:
-                    query = query.eq(field, value)
+        # keyset em (name, id): nomes podem se repetir
+        if after is not None:
+            name, player_id = after
+            query = query.or_(f"name.gt.{quote(name)},and(name.eq.{quote(name)},id.gt.{quote(player_id)})")
 
         # order
-        query = query.order("name")
+        query = query.order("name").order("id")
+
+        if limit is not None:
+            query = query.limit(limit)
 
         response = query.execute()
         return response.data or None
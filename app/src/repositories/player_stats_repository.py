@@ -0,0 +1,19 @@
+from typing import TYPE_CHECKING
+
+from src.repositories.client import get_client
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+class PlayerStatsRepository:
+    """Leitura de player_stats (mantida pelos triggers de trigger_update_player_stats.sql)."""
+
+    def __init__(self, client: "Client | None" = None):
+        self.supabase: "Client" = client or get_client()
+
+    def get(self, player_id: str) -> dict | None:
+        response = self.supabase.table("player_stats").select("*").eq("player_id", player_id).execute()
+        if response.data:
+            return response.data[0]
+        return None
@@ -0,0 +1,16 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse serializada com orjson. É a resposta padrão do app: cobre as
+    rotas sem response_model (as tipadas já serializam pelo pydantic em Rust).
+
+    Aceita dataclasses (ParsedPlayer), datetime/date e chaves não-str.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
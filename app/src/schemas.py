@@ -1,19 +1,130 @@
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# -------------------------------------------------------------------
+# players
+# Modelos de resposta: campos opcionais porque ?fields= devolve só parte das
+# colunas (as rotas usam response_model_exclude_unset). Timestamps e datas
+# ficam como str, repassados sem conversão.
+# -------------------------------------------------------------------
+class PlayerSchema(BaseModel):
+    id: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    name: Optional[str] = None
+    rating: Optional[float] = None
+
+
+class PlayerPageSchema(BaseModel):
+    items: List[PlayerSchema]
+    next_cursor: Optional[str] = None
+
+
+# -------------------------------------------------------------------
+# games
+# -------------------------------------------------------------------
+class GameSchema(BaseModel):
+    id: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    game_date: Optional[str] = None
+    game_price: Optional[float] = None
+    price_per_player: Optional[float] = None
+    goalkeepers_pay: Optional[bool] = None
+    players_total: Optional[int] = None
+    players_paid: Optional[int] = None
+    players_visitors: Optional[int] = None
+    total_amount: Optional[float] = None
+
+
+class GamePageSchema(BaseModel):
+    items: List[GameSchema]
+    next_cursor: Optional[str] = None
+
+
+# -------------------------------------------------------------------
+# games/players
+# -------------------------------------------------------------------
+class RosterPlayerSchema(BaseModel):
+    """Linha do elenco com o jogador e o convidador embutidos (ROSTER_COLUMNS)."""
+
+    id: str
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    is_goalkeeper: Optional[bool] = None
+    is_visitor: Optional[bool] = None
+    paid: Optional[bool] = None
+    amount_paid: Optional[float] = None
+    team: Optional[str] = None
+    player: Optional[PlayerSchema] = None
+    player_invited: Optional[PlayerSchema] = None
+
+
+class GameSnapshotSchema(GameSchema):
+    players: List[RosterPlayerSchema]
+    # ids dos jogadores por time
+    teams: Dict[str, List[Optional[str]]]
+    goalkeepers: List[Optional[str]]
+    no_team: List[Optional[str]]
 
 
 # -------------------------------------------------------------------
 # games/teams
 # -------------------------------------------------------------------
+class TeamPlayerSchema(BaseModel):
+    """Jogador de um time (lido de ParsedPlayer)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    invited_by_name: Optional[str] = None
+    is_goalkeeper: bool = False
+    is_visitor: bool = False
+    player_id: Optional[str] = None
+    invited_by_id: Optional[str] = None
+    team: Optional[str] = None
+    rating: Optional[float] = None
+
+
 class GenerateTeamsRequest(BaseModel):
     jogadores_raw: str
     zagueiros_fixos: List[str]
     habilidosos: List[str]
     players_per_team: Optional[int] = 6
+    # "random": sorteio (padrão) | "balanced": times equilibrados pelo rating
+    # | "best_of": melhor de `samples` sorteios, avaliados em lote
+    mode: Literal["random", "balanced", "best_of"] = "random"
+    # rating por nome (sobrepõe o players.rating salvo)
+    ratings: Optional[Dict[str, float]] = None
+    seed: Optional[int] = None
+    samples: int = Field(10_000, ge=1, le=200_000)
+    # preview: só parse + sorteio em memória, sem gravar nada (ver /teams/commit)
+    preview: bool = False
+    # defer: responde logo após o sorteio e grava o elenco em segundo plano (GET /jobs/{job_id})
+    defer: bool = False
+
+
+class CommitTeamsRequest(BaseModel):
+    # a mesma lista usada no preview e a divisão escolhida (time -> nomes)
+    jogadores_raw: str
+    teams: Dict[str, List[str]]
 
 
 class GenerateTeamsResponse(BaseModel):
     game_id: str
-    teams: Dict[str, List[Dict]]
+    teams: Dict[str, List[TeamPlayerSchema]]
+    # só no modo "best_of"
+    score: Optional[float] = None
+    runner_up_scores: Optional[List[float]] = None
+    preview: Optional[bool] = None
+    # só com defer
+    job_id: Optional[str] = None
+    status: Optional[str] = None
+
+
+class CommitTeamsResponse(BaseModel):
+    game_id: str
+    teams: Dict[str, List[TeamPlayerSchema]]
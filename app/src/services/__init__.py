@@ -1,19 +1,31 @@
+from .async_game_player_service import AsyncGamePlayerService
+from .async_game_service import AsyncGameService
+from .async_player_service import AsyncPlayerService
 from .game_player_service import (
     GamePlayerAddSchema,
+    GamePlayerPaymentSchema,
+    GamePlayerPaymentsSchema,
     GamePlayerService,
     GamePlayerUpdateSchema,
 )
 from .game_service import GameAddSchema, GameService, GameUpdateSchema
-from .game_team_service import GameTeamService
-from .player_service import PlayerService
+from .game_team_service import GameTeamService, ParsedPlayer
+from .player_service import PlayerAliasSchema, PlayerService
 
 __all__ = [
     "GameTeamService",
+    "ParsedPlayer",
     "PlayerService",
+    "PlayerAliasSchema",
     "GamePlayerService",
     "GamePlayerAddSchema",
+    "GamePlayerPaymentSchema",
+    "GamePlayerPaymentsSchema",
     "GamePlayerUpdateSchema",
     "GameService",
     "GameAddSchema",
     "GameUpdateSchema",
+    "AsyncPlayerService",
+    "AsyncGamePlayerService",
+    "AsyncGameService",
 ]
@@ -0,0 +1,177 @@
+from typing import TYPE_CHECKING, Optional
+
+from src.cache import invalidate_game, invalidate_player_games, response_cache
+from src.repositories import AsyncGamePlayerRepository
+from src.utils import normalize_name
+from src.services.async_game_service import AsyncGameService
+from src.services.async_player_service import AsyncPlayerService
+from src.services.game_player_service import (
+    GamePlayerAddSchema,
+    GamePlayerPaymentsSchema,
+    GamePlayerUpdateSchema,
+    build_player_update,
+    rpc_params,
+    use_update_rpc,
+    validate_player_update,
+)
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncGamePlayerService:
+    """Variante assíncrona de GamePlayerService, usada pelos endpoints async."""
+
+    def __init__(
+        self,
+        client: "AsyncClient | None" = None,
+        player_service: AsyncPlayerService | None = None,
+        game_service: AsyncGameService | None = None,
+    ):
+        self.repository = AsyncGamePlayerRepository(client)
+        self.player_service = player_service or AsyncPlayerService(client)
+        self.game_service = game_service or AsyncGameService(client)
+
+    async def add_player_in_game(self, game_id: str, data: GamePlayerAddSchema):
+        # Regras de negócio
+        if data.paid is True and data.amount_paid is None:
+            raise Exception("Para marcar o jogador como pago, é necessário informar o valor pago.")
+
+        if data.is_visitor is True and data.invited_by is None:
+            raise Exception("O jogador visitante deve ter um convidador.")
+
+        name = data.name.strip()
+        if not name:
+            raise ValueError("O nome do jogador não pode ser vazio.")
+        invited_by = (data.invited_by or "").strip() or None
+
+        # Preparar os dados para inserção
+        player_ids = await self.player_service.get_or_create_players([name, invited_by])
+
+        add_data = {
+            "game_id": game_id,
+            "player_id": player_ids[name],
+            "is_goalkeeper": data.is_goalkeeper,
+            "is_visitor": data.is_visitor,
+            "invited_by": player_ids[invited_by] if invited_by else None,
+            "paid": data.paid,
+            "amount_paid": data.amount_paid,
+            "team": data.team,
+        }
+
+        await self.repository.upsert(add_data)
+        invalidate_game(game_id)
+        invalidate_player_games(add_data["player_id"])
+
+    async def update_player_in_game(self, game_id, player_id, data: GamePlayerUpdateSchema) -> Optional[dict]:
+        """
+        Atualiza o jogador no jogo (ex.: marcar como pago).
+
+        Com UPDATE_GAME_PLAYER_RPC=true é uma única chamada à função
+        update_game_player, que aplica as regras e atualiza atomicamente. Senão,
+        busca a linha com os preços do jogo embutidos e faz o update: duas idas
+        ao banco. O convidador só é resolvido (e criado, se novo) depois de
+        confirmar que o jogador está no jogo.
+
+        Returns:
+            dict | None: Linha atualizada, ou None se o jogador não está no jogo.
+        """
+        if data.is_visitor is True and data.invited_by is None:
+            raise Exception("O jogador visitante deve ter um convidador.")
+
+        if use_update_rpc():
+            # a função só diz que a linha não existe depois de receber o id do convidador
+            if data.invited_by is not None and not await self.get_player_in_game(game_id, player_id):
+                return None
+            invited_by_id = await self._resolve_player_id(data.invited_by)
+            player = await self.repository.update_with_rules(game_id, player_id, rpc_params(data, invited_by_id))
+        else:
+            current = await self.repository.get_with_pricing(game_id, player_id)
+            if not current:
+                return None
+
+            # Regras de negócio
+            game = current.pop("game")
+            validate_player_update(game, data)
+            invited_by_id = await self._resolve_player_id(data.invited_by)
+            update_data = build_player_update(game, current, data, invited_by_id)
+            player = await self.repository.update(game_id, player_id, update_data)
+
+        if player:
+            invalidate_game(game_id)
+        return player
+
+    async def pay_players(self, game_id: str, data: GamePlayerPaymentsSchema) -> Optional[list[dict]]:
+        """
+        Marca vários jogadores como pagos de uma vez: lê o jogo com o elenco em um
+        select, aplica em memória as mesmas regras de update_player_in_game
+        (price_per_player / goalkeepers_pay) e grava tudo em um único upsert.
+
+        Returns:
+            list[dict] | None: Um resultado por pagamento, na ordem recebida:
+            {"player_id", "name", "status": "updated" | "not_found" | "error",
+             "paid", "amount_paid", "detail"}. None se o jogo não existe.
+        """
+        game = await self.game_service.repository.get_snapshot(game_id)
+        if not game:
+            return None
+
+        roster = game.pop("game_players") or []
+        by_id = {row["player"]["id"]: row for row in roster if row.get("player")}
+        by_name = {normalize_name(row["player"]["name"]): row for row in by_id.values()}
+
+        results = []
+        rows = {}
+        for payment in data.payments:
+            row = by_id.get(payment.player_id) if payment.player_id else by_name.get(normalize_name(payment.name or ""))
+            result = {"player_id": payment.player_id, "name": payment.name, "status": "not_found", "detail": None}
+            results.append(result)
+            if row is None:
+                continue
+
+            player_id = row["player"]["id"]
+            result.update(player_id=player_id, name=row["player"]["name"])
+            # sem valor informado vale o price_per_player do jogo (regra do amount_paid == 0)
+            amount_paid = payment.amount_paid
+            if payment.paid and amount_paid is None:
+                amount_paid = 0.0
+            update = GamePlayerUpdateSchema(paid=payment.paid, amount_paid=amount_paid)
+            try:
+                validate_player_update(game, update)
+            except Exception as exc:
+                result.update(status="error", detail=str(exc))
+                continue
+
+            update_data = build_player_update(game, row, update, None)
+            # todas as linhas do upsert com as mesmas chaves: o PostgREST grava null nas
+            # colunas que faltam em uma linha do lote, então o valor atual vai junto
+            rows[player_id] = {
+                "game_id": game_id,
+                "player_id": player_id,
+                "paid": update_data["paid"],
+                "amount_paid": update_data.get("amount_paid", row["amount_paid"]),
+            }
+            result.update(status="updated", paid=rows[player_id]["paid"], amount_paid=rows[player_id]["amount_paid"])
+
+        if rows:
+            await self.repository.upsert_many(list(rows.values()))
+            invalidate_game(game_id)
+
+        return results
+
+    async def get_player_in_game(self, game_id: str, player_id: str) -> Optional[dict]:
+        player = await self.repository.get({"game_id": game_id, "player_id": player_id})
+        if not player:
+            return None
+        return player[0]
+
+    async def get_players_in_game(self, game_id: str, version: str | None = None):
+        """version: versão atual do jogo (ver AsyncGameService.get_game)."""
+        return await response_cache.aget_or_load(
+            ("game_players", game_id), lambda: self.repository.get_players(game_id), version
+        )
+
+    async def _resolve_player_id(self, name: Optional[str]) -> Optional[str]:
+        if name is None:
+            return None
+        return (await self.player_service.get_or_create_players([name]))[name.strip()]
@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING
+
+from src.cache import response_cache
+from src.repositories import AsyncGameRepository
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncGameService:
+    """Variante assíncrona de GameService, usada pelos endpoints async."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self.repository = AsyncGameRepository(client)
+
+    async def get_game(self, game_id: str, version: str | None = None) -> dict | None:
+        """
+        Parameters:
+            version(str | None): Versão atual do jogo (get_game_version); o cache
+                guardado com outra versão é recarregado.
+        """
+        return await response_cache.aget_or_load(("game", game_id), lambda: self._load_game(game_id), version)
+
+    async def _load_game(self, game_id: str) -> dict | None:
+        # os totais (players_*, total_amount) são mantidos em games pelo trigger
+        game = await self.repository.get({"id": game_id})
+        if not game:
+            return None
+        return game[0]
+
+    async def get_game_version(self, game_id: str) -> str | None:
+        """
+        Versão do jogo e do seu elenco: games.updated_at (atualizado pelo trigger a
+        cada escrita em game_players e por update_game) ou created_at. Consulta barata,
+        usada nos GET condicionais.
+        """
+        game = await self.repository.get({"id": game_id}, columns="id, created_at, updated_at")
+        if not game:
+            return None
+        return game[0]["updated_at"] or game[0]["created_at"]
+
+    async def get_snapshot(self, game_id: str, version: str | None = None) -> dict | None:
+        return await response_cache.aget_or_load(
+            ("game_snapshot", game_id), lambda: self._load_snapshot(game_id), version
+        )
+
+    async def _load_snapshot(self, game_id: str) -> dict | None:
+        """
+        Tudo o que a página do jogo precisa com uma ida ao banco: o jogo, os totais,
+        o elenco (players) e a divisão atual dos times (ids dos jogadores por time;
+        goleiros e quem está sem time ficam em "goalkeepers" / "no_team").
+        """
+        game = await self.repository.get_snapshot(game_id)
+        if not game:
+            return None
+
+        roster = game.pop("game_players") or []
+
+        teams: dict[str, list[str]] = {}
+        goalkeepers = []
+        no_team = []
+        for row in roster:
+            player_id = (row.get("player") or {}).get("id")
+            if row["team"]:
+                teams.setdefault(row["team"], []).append(player_id)
+            elif row["is_goalkeeper"]:
+                goalkeepers.append(player_id)
+            else:
+                no_team.append(player_id)
+
+        game["players"] = roster
+        game["teams"] = dict(sorted(teams.items()))
+        game["goalkeepers"] = goalkeepers
+        game["no_team"] = no_team
+        return game
@@ -0,0 +1,87 @@
+from typing import TYPE_CHECKING
+
+from src.cache import invalidate_players, response_cache
+from src.repositories import AsyncPlayerAliasRepository, AsyncPlayerRepository
+from src.services.player_service import (
+    PLAYER_MATCH_ON_WRITE,
+    PlayerAddSchema,
+    check_distinct_players,
+    match_names,
+    player_index,
+    remember_player,
+    split_cached_names,
+)
+from src.utils import normalize_name
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncPlayerService:
+    """Variante assíncrona de PlayerService, usada pelos endpoints async."""
+
+    def __init__(self, client: "AsyncClient | None" = None):
+        self.repository = AsyncPlayerRepository(client)
+        self.alias_repository = AsyncPlayerAliasRepository(client)
+
+    async def load_index(self) -> int:
+        """Ver PlayerService.load_index."""
+        players = await self.repository.get(columns="id, name, name_normalized") or []
+        player_index.load(players, await self.alias_repository.get())
+        return len(player_index)
+
+    async def _ensure_index(self) -> None:
+        if player_index.stale:
+            await self.load_index()
+
+    async def _learn_aliases(self, similar: dict[str, str]) -> dict[str, str]:
+        """Ver PlayerService._learn_aliases."""
+        if not similar:
+            return {}
+        for player in await self.repository.get({"name_normalized": list(similar)}, columns="name_normalized") or []:
+            similar.pop(player["name_normalized"], None)
+        for key, player_id in similar.items():
+            await self.alias_repository.upsert(key, player_id)
+            player_index.add(key, player_id, alias=True)
+        if similar:
+            response_cache.invalidate_where("player_ids")
+        return similar
+
+    async def get_or_create_players(self, names: list[str | None]) -> dict[str, str]:
+        """
+        Mesma lógica de PlayerService.get_or_create_players (cache, índice de nomes
+        com nomes exatos, apelidos e PLAYER_MATCH_ON_WRITE, um INSERT em lote sem duplicar + SELECT IN dos
+        existentes).
+        """
+        ids, pending = split_cached_names(names)
+        if not pending:
+            return ids
+
+        keys = {}
+        for name in pending:
+            keys.setdefault(normalize_name(name), name)
+
+        await self._ensure_index()
+        resolved, similar = match_names(keys, PLAYER_MATCH_ON_WRITE)
+        resolved.update(await self._learn_aliases(similar))
+        missing = [name for key, name in keys.items() if key not in resolved]
+
+        created = await self.repository.create_missing([PlayerAddSchema(name=name).model_dump() for name in missing])
+        for player in created:
+            resolved[player["name_normalized"]] = remember_player(player)["id"]
+            player_index.add(player["name_normalized"], player["id"])
+        if created:
+            invalidate_players()
+
+        existing = [key for key in keys if key not in resolved]
+        if existing:
+            for player in await self.repository.get({"name_normalized": existing}) or []:
+                resolved[player["name_normalized"]] = remember_player(player)["id"]
+
+        for name in pending:
+            player_id = resolved.get(normalize_name(name))
+            if player_id:
+                ids[name] = player_id
+
+        check_distinct_players(ids)
+        return ids
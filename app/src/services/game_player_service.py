@@ -1,7 +1,15 @@
-from typing import Optional
+import os
+from datetime import date
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 from pydantic import BaseModel
-from src.repositories import GamePlayerRepository
+from src.cache import invalidate_game, invalidate_player_games, response_cache
+from src.repositories import GamePlayerRepository, get_client
+from src.services.game_team_service import ParsedPlayer
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class GamePlayerAddSchema(BaseModel):
@@ -23,9 +31,157 @@ class GamePlayerUpdateSchema(BaseModel):
     team: Optional[str] = None
 
 
+class GamePlayerPaymentSchema(BaseModel):
+    # identifica o jogador pelo id ou pelo nome
+    player_id: Optional[str] = None
+    name: Optional[str] = None
+    paid: bool = True
+    amount_paid: Optional[float] = None
+
+
+class GamePlayerPaymentsSchema(BaseModel):
+    payments: List[GamePlayerPaymentSchema]
+
+
+EXPORT_COLUMNS = (
+    "id, game_id, is_goalkeeper, is_visitor, paid, amount_paid, team, "
+    "player:player_id (id, name), player_invited:invited_by (id, name)"
+)
+EXPORT_FIELDS = (
+    "game_id",
+    "game_date",
+    "player_id",
+    "player_name",
+    "is_goalkeeper",
+    "is_visitor",
+    "invited_by",
+    "invited_by_name",
+    "paid",
+    "amount_paid",
+    "team",
+)
+
+
+def export_row(game: dict, row: dict) -> dict:
+    """Achata uma linha de game_players (EXPORT_COLUMNS) em um registro de EXPORT_FIELDS."""
+    player = row.get("player") or {}
+    invited = row.get("player_invited") or {}
+    return {
+        "game_id": game["id"],
+        "game_date": game["game_date"],
+        "player_id": player.get("id"),
+        "player_name": player.get("name"),
+        "is_goalkeeper": row["is_goalkeeper"],
+        "is_visitor": row["is_visitor"],
+        "invited_by": invited.get("id"),
+        "invited_by_name": invited.get("name"),
+        "paid": row["paid"],
+        "amount_paid": row["amount_paid"],
+        "team": row["team"],
+    }
+
+
+def validate_player_update(game: dict, data: GamePlayerUpdateSchema) -> None:
+    """Valida as regras de negócio de uma atualização de jogador no jogo."""
+    if data.paid is True and data.amount_paid is None and game["price_per_player"] is None:
+        raise Exception(
+            "Para marcar o jogador como pago, é necessário informar o valor pago ou ter um preço por jogador definido no jogo."
+        )
+
+    if data.is_visitor is True and data.invited_by is None:
+        raise Exception("O jogador visitante deve ter um convidador.")
+
+
+def build_player_update(
+    game: dict,
+    player: Optional[dict],
+    data: GamePlayerUpdateSchema,
+    invited_by_id: Optional[str],
+) -> dict:
+    """
+    Aplica as regras de preço (goleiro / price_per_player) e monta o dicionário
+    de atualização de game_players. Não acessa o banco.
+
+    Parameters:
+        game(dict): Jogo com price_per_player e goalkeepers_pay.
+        player(dict | None): Linha atual de game_players (necessária quando data.paid é True).
+        data(GamePlayerUpdateSchema): Dados recebidos.
+        invited_by_id(str | None): Id do convidador já resolvido.
+    """
+    if data.paid is True:
+        if data.is_goalkeeper is True or player["is_goalkeeper"] is True:
+            if game["goalkeepers_pay"] is False:
+                data.amount_paid = 0.0
+            else:
+                if game["price_per_player"] is not None:
+                    data.amount_paid = game["price_per_player"]
+        elif data.amount_paid == 0.0:
+            if game["price_per_player"] is not None:
+                data.amount_paid = game["price_per_player"]
+
+    # Prepara os dados para atualização
+    update_data = {}
+
+    if data.is_goalkeeper is not None:
+        update_data["is_goalkeeper"] = data.is_goalkeeper
+    if data.is_visitor is not None:
+        update_data["is_visitor"] = data.is_visitor
+    if data.invited_by is not None:
+        update_data["invited_by"] = invited_by_id
+    if data.paid is not None:
+        update_data["paid"] = data.paid
+    if data.amount_paid is not None:
+        update_data["amount_paid"] = data.amount_paid if data.paid else 0.0
+    if data.team is not None:
+        update_data["team"] = data.team
+
+    return update_data
+
+
+def use_update_rpc() -> bool:
+    """UPDATE_GAME_PLAYER_RPC=true usa a função update_game_player (uma ida ao banco)."""
+    return os.environ.get("UPDATE_GAME_PLAYER_RPC", "false").lower() == "true"
+
+
+def rpc_params(data: GamePlayerUpdateSchema, invited_by_id: Optional[str]) -> dict:
+    """Parâmetros de update_game_player: os mesmos campos de GamePlayerUpdateSchema."""
+    return {
+        "is_goalkeeper": data.is_goalkeeper,
+        "is_visitor": data.is_visitor,
+        "invited_by": invited_by_id,
+        "paid": data.paid,
+        "amount_paid": data.amount_paid,
+        "team": data.team,
+    }
+
+
 class GamePlayerService:
-    def __init__(self):
-        self.repository = GamePlayerRepository()
+    def __init__(
+        self,
+        client: "Client | None" = None,
+        player_service=None,
+        game_service=None,
+    ):
+        self.client = client or get_client()
+        self.repository = GamePlayerRepository(self.client)
+        self._player_service = player_service
+        self._game_service = game_service
+
+    @property
+    def player_service(self):
+        if self._player_service is None:
+            from src.services.player_service import PlayerService
+
+            self._player_service = PlayerService(self.client)
+        return self._player_service
+
+    @property
+    def game_service(self):
+        if self._game_service is None:
+            from src.services.game_service import GameService
+
+            self._game_service = GameService(self.client)
+        return self._game_service
 
     def upsert_game_player(
         self,
@@ -46,9 +202,47 @@ class GamePlayerService:
         }
 
         resp = self.repository.upsert(data)
+        invalidate_game(game_id)
+        invalidate_player_games(player_id)
 
         return resp
 
+    def upsert_game_players(self, game_id: str, players: list[ParsedPlayer]) -> list[dict]:
+        """
+        Persiste um elenco inteiro em um único upsert (game_id, player_id).
+
+        Parameters:
+            game_id(str): Id do jogo.
+            players(list[ParsedPlayer]): Jogadores já com player_id (e invited_by_id / team).
+
+        Returns:
+            list[dict]: Um resultado por jogador de entrada, na mesma ordem:
+            {"player_id": str, "saved": bool, "data": dict | None}
+        """
+        rows = {}
+        for p in players:
+            rows[p.player_id] = {
+                "game_id": game_id,
+                "player_id": p.player_id,
+                "is_goalkeeper": p.is_goalkeeper,
+                "is_visitor": p.is_visitor,
+                "invited_by": p.invited_by_id,
+                "team": p.team,
+            }
+
+        saved = {row["player_id"]: row for row in self.repository.upsert_many(list(rows.values()))}
+        invalidate_game(game_id)
+        invalidate_player_games(*rows)
+
+        return [
+            {
+                "player_id": p.player_id,
+                "saved": p.player_id in saved,
+                "data": saved.get(p.player_id),
+            }
+            for p in players
+        ]
+
     def add_player_in_game(self, game_id: str, data: GamePlayerAddSchema):
         # Regras de negócio
         if data.paid is True and data.amount_paid is None:
@@ -57,73 +251,28 @@ class GamePlayerService:
         if data.is_visitor is True and data.invited_by is None:
             raise Exception("O jogador visitante deve ter um convidador.")
 
-        # Preparar os dados para inserção
-        from src.services.player_service import PlayerService
+        name = data.name.strip()
+        if not name:
+            raise ValueError("O nome do jogador não pode ser vazio.")
+        invited_by = (data.invited_by or "").strip() or None
 
-        player_service = PlayerService()
+        # Preparar os dados para inserção
+        player_ids = self.player_service.get_or_create_players([name, invited_by])
 
         add_data = {
             "game_id": game_id,
-            "player_id": player_service.get_or_create_player(data.name)["id"],
+            "player_id": player_ids[name],
             "is_goalkeeper": data.is_goalkeeper,
             "is_visitor": data.is_visitor,
-            "invited_by": (player_service.get_or_create_player(data.invited_by)["id"] if data.invited_by else None),
+            "invited_by": player_ids[invited_by] if invited_by else None,
             "paid": data.paid,
             "amount_paid": data.amount_paid,
             "team": data.team,
         }
 
         self.repository.upsert(add_data)
-
-    def update_player_in_game(self, game_id, player_id, data: GamePlayerUpdateSchema):
-        print("update_player_in_game", data)
-        # Regras de negócio
-        from src.services.game_service import GameService
-
-        game = GameService().get_game(game_id)
-
-        if data.paid is True and data.amount_paid is None and game["price_per_player"] is None:
-            raise Exception(
-                "Para marcar o jogador como pago, é necessário informar o valor pago ou ter um preço por jogador definido no jogo."
-            )
-
-        if data.is_visitor is True and data.invited_by is None:
-            raise Exception("O jogador visitante deve ter um convidador.")
-
-        if data.paid is True:
-            player = self.get_player_in_game(game_id, player_id)
-            if data.is_goalkeeper is True or player["is_goalkeeper"] is True:
-                if game["goalkeepers_pay"] is False:
-                    data.amount_paid = 0.0
-                else:
-                    if game["price_per_player"] is not None:
-                        data.amount_paid = game["price_per_player"]
-            elif data.amount_paid == 0.0:
-                if game["price_per_player"] is not None:
-                    print("Setting amount_paid to price_per_player:", game["price_per_player"])
-                    data.amount_paid = game["price_per_player"]
-
-        # Prepara os dados para atualização
-        update_data = {}
-
-        if data.is_goalkeeper is not None:
-            update_data["is_goalkeeper"] = data.is_goalkeeper
-        if data.is_visitor is not None:
-            update_data["is_visitor"] = data.is_visitor
-        if data.invited_by is not None:
-            from src.services.player_service import PlayerService
-
-            player_service = PlayerService()
-            update_data["invited_by"] = player_service.get_or_create_player(data.invited_by)["id"]
-        if data.paid is not None:
-            update_data["paid"] = data.paid
-        if data.amount_paid is not None:
-            update_data["amount_paid"] = data.amount_paid if data.paid else 0.0
-        if data.team is not None:
-            update_data["team"] = data.team
-
-        print("update_data", update_data)
-        return self.repository.update(game_id, player_id, update_data)
+        invalidate_game(game_id)
+        invalidate_player_games(add_data["player_id"])
 
     def get_player_in_game(self, game_id: str, player_id: str) -> Optional[dict]:
         palyer = self.repository.get({"game_id": game_id, "player_id": player_id})
@@ -132,7 +281,43 @@ class GamePlayerService:
         return palyer[0]
 
     def get_players_in_game(self, game_id: str):
-        return self.repository.get_players(game_id)
+        return response_cache.get_or_load(("game_players", game_id), lambda: self.repository.get_players(game_id))
+
+    def iter_game_players(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        games_per_page: int = 50,
+        page_size: int = 1000,
+    ) -> Iterator[dict]:
+        """
+        Percorre as linhas de game_players (registros de EXPORT_FIELDS) em ordem de
+        data do jogo. Os jogos vêm em páginas de games_per_page e o elenco de cada
+        página em consultas paginadas por id, então só uma página fica em memória.
+        """
+        games = self.game_service.iter_games(date_from, date_to, page_size=games_per_page)
+        while batch := list(islice(games, games_per_page)):
+            rows_by_game = {game["id"]: [] for game in batch}
+            after = None
+            while True:
+                rows = (
+                    self.repository.get(
+                        {"game_id": list(rows_by_game)}, columns=EXPORT_COLUMNS, limit=page_size, after=after
+                    )
+                    or []
+                )
+                for row in rows:
+                    rows_by_game[row["game_id"]].append(row)
+                if len(rows) < page_size:
+                    break
+                after = rows[-1]["id"]
+
+            for game in batch:
+                for row in rows_by_game[game["id"]]:
+                    yield export_row(game, row)
 
     def delete_player_in_game(self, game_id, player_id):
-        return self.repository.delete(game_id, player_id)
+        result = self.repository.delete(game_id, player_id)
+        invalidate_game(game_id)
+        invalidate_player_games(player_id)
+        return result
@@ -1,8 +1,13 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from pydantic import BaseModel
-from src.repositories import GameRepository
+from src.cache import invalidate_game, response_cache
+from src.repositories import GameRepository, get_client
+from src.utils import decode_cursor, encode_cursor
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class GameAddSchema(BaseModel):
@@ -19,18 +24,40 @@ class GameUpdateSchema(BaseModel):
     goalkeepers_pay: bool = None
 
 
+TOTALS_FIELDS = ("players_total", "players_paid", "total_amount", "players_visitors")
+GAME_FIELDS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "game_date",
+    "game_price",
+    "price_per_player",
+    "goalkeepers_pay",
+    *TOTALS_FIELDS,
+)
+
+
+def date_filters(date_from: date | None, date_to: date | None) -> dict:
+    """Filtro de intervalo (inclusivo) em game_date."""
+    return {
+        "game_date": {
+            "gte": date_from.isoformat() if date_from else None,
+            "lte": date_to.isoformat() if date_to else None,
+        }
+    }
+
+
 class GameService:
-    def __init__(self):
-        self.repository = GameRepository()
+    def __init__(self, client: "Client | None" = None):
+        self.repository = GameRepository(client or get_client())
 
     def get_or_create_game(self, body: GameAddSchema) -> dict | None:
-        game = self.get_game_by_date(body.game_date)
+        # um único INSERT ... ON CONFLICT (game_date) DO NOTHING; só lê o jogo se a data já existia
+        game = self.repository.create_if_absent(body.model_dump(mode="json"))
         if game:
+            response_cache.invalidate_where("games")
             return game
-
-        body.game_date = body.game_date.isoformat()
-
-        return self.repository.create(body.model_dump())
+        return self.get_game_by_date(body.game_date)
 
     def update_game(self, game_id: str, body: GameUpdateSchema) -> dict | None:
         # Prepara os dados para atualização
@@ -44,51 +71,99 @@ class GameService:
         if body.goalkeepers_pay:
             update_data["goalkeepers_pay"] = body.goalkeepers_pay
 
-        return self.repository.update(game_id, update_data)
+        # muda a versão usada no ETag / Last-Modified de GET /games/{game_id}
+        update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        game = self.repository.update(game_id, update_data)
+        invalidate_game(game_id)
+        return game
 
     def get_game(self, game_id: str) -> dict | None:
+        return response_cache.get_or_load(("game", game_id), lambda: self._load_game(game_id))
+
+    def _load_game(self, game_id: str) -> dict | None:
+        # os totais (players_*, total_amount) são mantidos em games pelo trigger
         game = self.repository.get({"id": game_id})
         if not game:
             return None
-        game = game[0]
-
-        # Adiciona os totais de jogadores e valores pagos
-        return self._get_game_with_totals(game)
+        return game[0]
 
     def get_game_by_date(self, game_date: date) -> dict | None:
         game_date = game_date.isoformat()
         game = self.repository.get({"game_date": game_date})
         if not game:
             return None
-        game = game[0]
-
-        # Adiciona os totais de jogadores e valores pagos
-        return self._get_game_with_totals(game)
-
-    def get_games(self) -> list[dict]:
-        games = self.repository.get()
-        if not games:
-            return []
-
-        # Adiciona os totais de jogadores e valores pagos
-        return [self._get_game_with_totals(game) for game in games]
+        return game[0]
+
+    def get_games(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[dict] | dict:
+        """
+        Lista os jogos (mais recentes primeiro) com os totais.
+
+        Sem limit/cursor devolve a lista inteira, como antes. Com limit/cursor
+        devolve uma página {"items": [...], "next_cursor": str | None}.
+
+        Parameters:
+            limit(int | None): Tamanho da página.
+            cursor(str | None): next_cursor da página anterior.
+            fields(list[str] | None): Colunas a devolver (ver GAME_FIELDS).
+            date_from(date | None) / date_to(date | None): Intervalo de game_date (inclusivo).
+        """
+        key = ("games", limit, cursor, tuple(fields) if fields else None, date_from, date_to)
+        return response_cache.get_or_load(key, lambda: self._load_games(limit, cursor, fields, date_from, date_to))
+
+    def _load_games(self, limit, cursor, fields, date_from, date_to) -> list[dict] | dict:
+        if fields:
+            invalid = [f for f in fields if f not in GAME_FIELDS]
+            if invalid:
+                raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+            # game_date é necessário para o cursor
+            columns = ",".join(dict.fromkeys(["game_date", *fields]))
+        else:
+            columns = "*"
+
+        after = decode_cursor(cursor, 1)[0] if cursor else None
+
+        games = self.repository.get(date_filters(date_from, date_to), columns=columns, limit=limit, after=after) or []
+
+        page_last = games[-1] if games else None
+        if fields:
+            games = [{f: game.get(f) for f in fields} for game in games]
+
+        if limit is None and cursor is None:
+            return games
+
+        next_cursor = None
+        if limit is not None and len(games) == limit:
+            next_cursor = encode_cursor([page_last["game_date"]])
+        return {"items": games, "next_cursor": next_cursor}
+
+    def iter_games(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        page_size: int = 500,
+    ) -> Iterator[dict]:
+        """
+        Percorre os jogos do mais antigo para o mais recente, uma página (keyset)
+        por consulta, sem montar a lista inteira. Usado pela exportação.
+        """
+        filters = date_filters(date_from, date_to)
+        after = None
+        while True:
+            games = self.repository.get(filters, limit=page_size, after=after, descending=False) or []
+            yield from games
+            if len(games) < page_size:
+                return
+            after = games[-1]["game_date"]
 
     def delete_game(self, game_id: str) -> None:
-        return self.repository.delete(game_id)
-
-    def _get_game_with_totals(self, game: dict) -> dict:
-        from src.services.game_player_service import GamePlayerService
-
-        gp_service = GamePlayerService()
-        players = gp_service.get_players_in_game(game["id"]) or []
-        players_total = len(players) if players else 0
-        players_paid = sum(1 for player in players if player["amount_paid"] and player["amount_paid"] > 0)
-        players_visitors = sum(1 for player in players if player["is_visitor"])
-        total_amount = sum(player["amount_paid"] for player in players if player["amount_paid"])
-
-        game["players_total"] = players_total
-        game["players_paid"] = players_paid
-        game["total_amount"] = total_amount
-        game["players_visitors"] = players_visitors
-
-        return game
+        result = self.repository.delete(game_id)
+        invalidate_game(game_id)
+        return result
@@ -1,90 +1,167 @@
+import hashlib
+import math
+import os
 import random
 import re
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, Optional
 
-from emoji import replace_emoji
+from src.cache import TTLCache
 from src.utils import normalize_name
 
+_ENTRY_RE = re.compile(r"^\d+\.\s*(.+)$")
+_INVITE_RE = re.compile(r"^(.*?)\s*\(([^)]+)\)\s*$")
+# Acentos (Latin-1 / Latin Extended) não passam por replace_emoji; o resto pode ser emoji
+_MAYBE_EMOJI_RE = re.compile("[\u00a9\u00ae\u0250-\U0010ffff]")
+
+# Cabeçalhos de seção, na ordem de prioridade em que são testados
+_SECTIONS = (
+    ("GOLEIROS", "goleiros"),
+    ("DA CASA", "casa"),
+    ("VISITANTES", "visitantes"),
+    ("NÃO VÃO", "nao_vao"),
+    ("NAO VAO", "nao_vao"),
+)
+
+# Listas já parseadas, por hash do texto: re-sorteios da mesma lista não parseiam de novo
+parse_cache = TTLCache(
+    maxsize=int(os.environ.get("PARSE_CACHE_SIZE", 64)),
+    ttl=float(os.environ.get("PARSE_CACHE_TTL", 600)),
+)
+
+
+def raw_key(jogadores_raw: str) -> str:
+    """Hash do texto bruto da lista, usado como chave dos caches do preview."""
+    return hashlib.sha256(jogadores_raw.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class ParsedPlayer:
+    """Jogador lido da lista. player_id, invited_by_id, team e rating são preenchidos depois."""
+
+    name: str
+    invited_by_name: Optional[str]
+    is_goalkeeper: bool
+    is_visitor: bool
+    player_id: Optional[str] = None
+    invited_by_id: Optional[str] = None
+    team: Optional[str] = None
+    rating: Optional[float] = None
+
+
+def iter_jogadores(lines: Iterable[str]) -> Iterator[ParsedPlayer]:
+    """
+    Máquina de estados de uma passada sobre as linhas da lista: cada linha é
+    lida uma vez, a seção atual é o estado e cada entrada válida vira um
+    ParsedPlayer assim que é lida.
+    """
+    replace_emoji = None
+    section = None
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Só linhas com caracteres fora do ASCII / latim acentuado podem ter emoji
+        if not line.isascii() and _MAYBE_EMOJI_RE.search(line):
+            if replace_emoji is None:
+                from emoji import replace_emoji  # import tardio: emoji carrega uma tabela grande
+            line = replace_emoji(line, replace="").strip()
+            if not line:
+                continue
 
-class GameTeamService:
-    def __init__(self):
-        pass
+        upper = line.upper()
+        header = next((state for token, state in _SECTIONS if token in upper), None)
+        if header is not None:
+            section = header
+            continue
 
-    def parse_jogadores_raw(self, jogadores_raw: str) -> dict:
-        """
-        Faz o parse do texto bruto da lista de jogadores (copiado do WhatsApp, por exemplo)
-        e retorna uma lista de jogadores estruturada em dicionários.
+        if section is None or section == "nao_vao":
+            continue
 
-        Parameters:
-            jogadores_raw(str): Texto bruto contendo a lista de jogadores e seções.
+        m = _ENTRY_RE.match(line)
+        if not m:
+            continue
 
-        Returns:
-            list[dict]: Lista de dicionários de jogadores no formato:
-            {
-                "name": str,
-                "invited_by_name": str | None,
-                "is_goalkeeper": bool,
-                "is_visitor": bool
-            }
-        """
-        jogadores_raw = replace_emoji(jogadores_raw, replace="")
+        raw = m.group(1).strip()
+        if not raw or raw == ".":
+            continue
 
-        lines = jogadores_raw.splitlines()
-        section = None
-        players = []
+        invited_by_name = None
+        name_part = raw
+        paren = _INVITE_RE.match(raw)
+        if paren:
+            name_part = paren.group(1).strip()
+            invited_by_name = paren.group(2).strip()
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        # "1. (Carlos)": só o convidador, sem o nome do jogador
+        name = normalize_name(name_part)
+        if not name:
+            continue
 
-            if "GOLEIROS" in line.upper():
-                section = "goleiros"
-                continue
-            if "DA CASA" in line.upper():
-                section = "casa"
-                continue
-            if "VISITANTES" in line.upper():
-                section = "visitantes"
-                continue
-            if "NÃO VÃO" in line.upper() or "NAO VAO" in line.upper():
-                section = "nao_vao"
-                continue
+        is_goalkeeper = section == "goleiros"
+        yield ParsedPlayer(
+            name=name,
+            invited_by_name=normalize_name(invited_by_name) or None,
+            is_goalkeeper=is_goalkeeper,
+            is_visitor=(section == "visitantes") or (is_goalkeeper and invited_by_name is not None),
+        )
 
-            m = re.match(r"^\d+\.\s*(.+)$", line)
-            if not m or section is None:
-                continue
 
-            raw = m.group(1).strip()
-            if not raw or raw == ".":
-                continue
+def team_capacities(n_players: int, players_per_team: int) -> list[int]:
+    """
+    Tamanho de cada time no mesmo formato do generate_teams: 2 times (divididos
+    por igual) ou, se não couber, times cheios e o resto no último.
+    """
+    n_teams = max(2, math.ceil(n_players / players_per_team))
+    if n_teams == 2:
+        return [math.ceil(n_players / 2), n_players // 2]
+    return [players_per_team] * (n_teams - 1) + [n_players - players_per_team * (n_teams - 1)]
 
-            paren = re.match(r"^(.*?)\s*\(([^)]+)\)\s*$", raw)
-            invited_by_name = None
-            name_part = raw
-            if paren:
-                name_part = paren.group(1).strip()
-                invited_by_name = paren.group(2).strip()
 
-            if section == "nao_vao":
-                continue
+@dataclass(slots=True)
+class SampledTeams:
+    """Resultado de sample_teams: melhor divisão, seu score e os scores seguintes."""
 
-            is_goalkeeper = section == "goleiros"
-            is_visitor = (section == "visitantes") or (
-                section == "goleiros" and invited_by_name is not None
-            )
+    teams: dict[str, list[ParsedPlayer]]
+    score: float
+    runner_up_scores: list[float]
 
-            players.append(
-                {
-                    "name": normalize_name(name_part),
-                    "invited_by_name": (
-                        normalize_name(invited_by_name) if invited_by_name else None
-                    ),
-                    "is_goalkeeper": is_goalkeeper,
-                    "is_visitor": is_visitor,
-                }
-            )
 
-        return players
+class GameTeamService:
+    def __init__(self):
+        pass
+
+    def parse_jogadores_raw(self, jogadores_raw: str | Iterable[str]) -> list[ParsedPlayer]:
+        """
+        Faz o parse do texto bruto da lista de jogadores (copiado do WhatsApp, por exemplo)
+        e retorna uma lista de jogadores estruturada.
+
+        Parameters:
+            jogadores_raw(str | Iterable[str]): Texto bruto contendo a lista de jogadores
+                e seções, ou um iterável de linhas (ex.: um arquivo aberto).
+
+        Returns:
+            list[ParsedPlayer]: Jogadores com name, invited_by_name, is_goalkeeper e is_visitor.
+        """
+        if isinstance(jogadores_raw, str):
+            jogadores_raw = jogadores_raw.splitlines()
+        return list(iter_jogadores(jogadores_raw))
+
+    def parse_jogadores_raw_cached(self, jogadores_raw: str) -> list[ParsedPlayer]:
+        """
+        parse_jogadores_raw com cache pelo hash do texto (raw_key).
+
+        Returns:
+            list[ParsedPlayer]: Cópias novas a cada chamada (quem chama preenche team, ids e rating).
+        """
+        key = raw_key(jogadores_raw)
+        parsed = parse_cache.get(key)
+        if parsed is None:
+            parsed = self.parse_jogadores_raw(jogadores_raw)
+            parse_cache.set(key, parsed)
+        return [replace(p) for p in parsed]
 
     def generate_teams(
         self, players, zagueiros_fixos, habilidosos, players_per_team: int = 6
@@ -97,7 +174,7 @@ class GameTeamService:
             players_per_team = 6
 
         for p in players:
-            n = p["name"]
+            n = p.name
             if n in zagueiros_fixos:
                 defenders.append(p)
             elif n in habilidosos:
@@ -223,6 +300,230 @@ class GameTeamService:
         # ---------------------------
         for key, players in teams.items():
             for p in players:
-                p["team"] = key
+                p.team = key
 
         return teams
+
+    def balance_teams(
+        self,
+        players: list[ParsedPlayer],
+        zagueiros_fixos,
+        habilidosos,
+        players_per_team: int = 6,
+        seed: Optional[int] = None,
+        default_rating: Optional[float] = None,
+        max_passes: int = 50,
+    ) -> dict[str, list[ParsedPlayer]]:
+        """
+        Monta os times minimizando a diferença de força (média de rating) entre eles.
+
+        Mesmo formato de generate_teams (mínimo de 2 times, novos times só quando os
+        anteriores estão cheios), mas em vez de sorteio usa:
+          1) guloso do maior para o menor rating, sempre no time mais fraco com vaga,
+             espalhando zagueiros e habilidosos (mesma quantidade por time, ±1);
+          2) busca local: troca pares do mesmo grupo entre times enquanto a
+             diferença entre o time mais forte e o mais fraco diminuir.
+
+        Parameters:
+            players(list[ParsedPlayer]): Jogadores de linha (sem goleiros), com rating opcional.
+            zagueiros_fixos(list[str]): Nomes que contam como zagueiros.
+            habilidosos(list[str]): Nomes que contam como habilidosos.
+            players_per_team(int): Tamanho máximo de cada time.
+            seed(int | None): Semente para desempate reprodutível.
+            default_rating(float | None): Rating de quem não tem; padrão é a média dos conhecidos.
+            max_passes(int): Limite de passadas da busca local.
+
+        Returns:
+            dict[str, list[ParsedPlayer]]: Times (A, B, ...) com o campo team preenchido.
+        """
+        rng = random.Random(seed)
+        if players_per_team is None:
+            players_per_team = 6
+
+        known = [p.rating for p in players if p.rating is not None]
+        if default_rating is None:
+            default_rating = sum(known) / len(known) if known else 5.0
+
+        capacity = team_capacities(len(players), players_per_team)
+        n_teams = len(capacity)
+        team_keys = [chr(ord("A") + i) for i in range(n_teams)]
+
+        def group_of(p: ParsedPlayer) -> int:
+            if p.name in zagueiros_fixos:
+                return 0
+            if p.name in habilidosos:
+                return 1
+            return 2
+
+        rating = {id(p): (p.rating if p.rating is not None else default_rating) for p in players}
+        group = {id(p): group_of(p) for p in players}
+        members: list[list[ParsedPlayer]] = [[] for _ in team_keys]
+        sums = [0.0] * n_teams
+        group_counts = [[0, 0, 0] for _ in team_keys]
+
+        # 1) Guloso: maior rating primeiro, no time com menos gente do grupo e mais fraco
+        shuffled = list(players)
+        rng.shuffle(shuffled)
+        for p in sorted(shuffled, key=lambda p: (group[id(p)], -rating[id(p)])):
+            g = group[id(p)]
+            open_teams = [t for t in range(n_teams) if len(members[t]) < capacity[t]]
+            t = min(open_teams, key=lambda t: (group_counts[t][g], sums[t] / capacity[t]))
+            members[t].append(p)
+            sums[t] += rating[id(p)]
+            group_counts[t][g] += 1
+
+        # 2) Busca local: trocas entre jogadores do mesmo grupo (mantém a distribuição)
+        active = [t for t in range(n_teams) if members[t]]
+        avgs = {t: sums[t] / len(members[t]) for t in active}
+        best = max(avgs.values()) - min(avgs.values()) if avgs else 0.0
+
+        for _ in range(max_passes):
+            improved = False
+            for a in active:
+                for b in active:
+                    if b <= a:
+                        continue
+                    # extremos dos outros times não mudam durante a troca a <-> b
+                    others = [avgs[t] for t in active if t != a and t != b]
+                    others_max = max(others, default=-math.inf)
+                    others_min = min(others, default=math.inf)
+                    size_a, size_b = len(members[a]), len(members[b])
+
+                    for i in range(size_a):
+                        for j in range(size_b):
+                            pa, pb = members[a][i], members[b][j]
+                            if group[id(pa)] != group[id(pb)]:
+                                continue
+                            delta = rating[id(pb)] - rating[id(pa)]
+                            if delta == 0:
+                                continue
+                            new_a = (sums[a] + delta) / size_a
+                            new_b = (sums[b] - delta) / size_b
+                            score = max(new_a, new_b, others_max) - min(new_a, new_b, others_min)
+                            if score < best - 1e-9:
+                                members[a][i], members[b][j] = pb, pa
+                                sums[a] += delta
+                                sums[b] -= delta
+                                avgs[a], avgs[b] = new_a, new_b
+                                best = score
+                                improved = True
+            if not improved:
+                break
+
+        # sempre A e B, mesmo com 0 ou 1 jogador (mesmo formato de generate_teams)
+        teams = {}
+        for key, team_players in zip(team_keys, members):
+            for p in team_players:
+                p.team = key
+            teams[key] = team_players
+
+        return teams
+
+    def sample_teams(
+        self,
+        players: list[ParsedPlayer],
+        zagueiros_fixos,
+        habilidosos,
+        players_per_team: int = 6,
+        samples: int = 10_000,
+        seed: Optional[int] = None,
+        default_rating: Optional[float] = None,
+        defender_weight: float = 10.0,
+        skilled_weight: float = 1.0,
+        runner_ups: int = 5,
+        chunk_size: int = 4096,
+    ) -> SampledTeams:
+        """
+        Sorteia `samples` divisões candidatas e devolve a de menor score.
+
+        Todas as candidatas de um bloco são avaliadas de uma vez com NumPy: cada
+        candidata é uma permutação dos jogadores sobre os "lugares" dos times, e
+        as somas por time saem de um produto de matrizes (candidatas x lugares)
+        @ (lugares x times). Score (menor é melhor):
+
+            diferença entre a maior e a menor média de rating dos times
+            + defender_weight * times sem zagueiro (quando há zagueiros para eles)
+            + skilled_weight * (diferença de habilidosos entre times acima de 1)
+
+        Parameters:
+            players(list[ParsedPlayer]): Jogadores de linha (sem goleiros), com rating opcional.
+            zagueiros_fixos(list[str]): Nomes que contam como zagueiros.
+            habilidosos(list[str]): Nomes que contam como habilidosos.
+            players_per_team(int): Tamanho máximo de cada time.
+            samples(int): Quantidade de divisões candidatas (K).
+            seed(int | None): Semente para resultado reprodutível.
+            default_rating(float | None): Rating de quem não tem; padrão é a média dos conhecidos.
+            runner_ups(int): Quantos scores seguintes ao melhor devolver.
+            chunk_size(int): Candidatas avaliadas por bloco (limita a memória).
+
+        Returns:
+            SampledTeams: Times (A, B, ...) com o campo team preenchido, score e runner_up_scores.
+        """
+        import numpy as np  # import tardio: só este modo usa NumPy
+
+        if players_per_team is None:
+            players_per_team = 6
+
+        samples = max(1, samples)
+        n = len(players)
+        capacity = team_capacities(n, players_per_team)
+        team_keys = [chr(ord("A") + i) for i in range(len(capacity))]
+        if n == 0:
+            # só goleiros (ou lista vazia): nada a sortear
+            return SampledTeams(teams={key: [] for key in team_keys}, score=0.0, runner_up_scores=[])
+
+        known = [p.rating for p in players if p.rating is not None]
+        if default_rating is None:
+            default_rating = sum(known) / len(known) if known else 5.0
+
+        ratings = np.array([p.rating if p.rating is not None else default_rating for p in players], dtype=float)
+        is_defender = np.array([p.name in zagueiros_fixos for p in players], dtype=float)
+        is_skilled = np.array([p.name not in zagueiros_fixos and p.name in habilidosos for p in players], dtype=float)
+
+        # lugar -> time (matriz one-hot lugares x times), só times com lugares
+        cap = np.array([c for c in capacity if c > 0], dtype=float)
+        slot_team = np.repeat(np.arange(len(cap)), cap.astype(int))
+        onehot = np.zeros((n, len(cap)))
+        onehot[np.arange(n), slot_team] = 1.0
+        wanted_defenders = min(int(is_defender.sum()), len(cap))
+
+        rng = np.random.default_rng(seed)
+        base = np.arange(n)
+        scores = []
+        best_score = np.inf
+        best_perm = base
+
+        for start in range(0, samples, chunk_size):
+            k = min(chunk_size, samples - start)
+            # perm[c, lugar] = índice do jogador nesse lugar na candidata c
+            perm = rng.permuted(np.broadcast_to(base, (k, n)), axis=1)
+
+            avgs = (ratings[perm] @ onehot) / cap
+            defenders = is_defender[perm] @ onehot
+            skilled = is_skilled[perm] @ onehot
+
+            score = avgs.max(axis=1) - avgs.min(axis=1)
+            score += defender_weight * (wanted_defenders - (defenders > 0).sum(axis=1))
+            score += skilled_weight * np.maximum(0.0, skilled.max(axis=1) - skilled.min(axis=1) - 1)
+
+            i = int(score.argmin())
+            if score[i] < best_score:
+                best_score = float(score[i])
+                best_perm = perm[i].copy()
+            scores.append(score)
+
+        all_scores = np.concatenate(scores)
+        top = min(runner_ups + 1, all_scores.size)
+        ranked = np.sort(np.partition(all_scores, top - 1)[:top])
+
+        teams = {key: [] for key in team_keys}
+        for slot, player_index in enumerate(best_perm):
+            p = players[player_index]
+            p.team = team_keys[slot_team[slot]]
+            teams[p.team].append(p)
+
+        return SampledTeams(
+            teams=teams,
+            score=round(best_score, 4),
+            runner_up_scores=[round(float(s), 4) for s in ranked[1:]],
+        )
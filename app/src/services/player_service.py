@@ -1,24 +1,251 @@
+import os
+from typing import TYPE_CHECKING
+
 from pydantic import BaseModel
-from src.repositories import GamePlayerRepository, PlayerRepository
+from src.cache import TTLCache, invalidate_game, invalidate_player, invalidate_players, response_cache
+from src.matching import NameIndex
+from src.repositories import (
+    GamePlayerRepository,
+    GameRepository,
+    PlayerAliasRepository,
+    PlayerRepository,
+    PlayerStatsRepository,
+    get_client,
+)
+from src.utils import decode_cursor, encode_cursor, normalize_name
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Índice nome normalizado -> linha de players, compartilhado por todas as
+# instâncias de PlayerService (e AsyncPlayerService) do processo.
+player_name_cache = TTLCache(
+    maxsize=int(os.environ.get("PLAYER_CACHE_SIZE", 512)),
+    ttl=float(os.environ.get("PLAYER_CACHE_TTL", 600)),
+)
+
+# Índice dos nomes normalizados + apelidos confirmados. Por padrão só nomes exatos e
+# apelidos resolvem nas escritas; a similaridade só sugere (GET /players/match).
+# PLAYER_MATCH_THRESHOLD=0 desliga o "matched" das sugestões.
+player_index = NameIndex(
+    threshold=float(os.environ.get("PLAYER_MATCH_THRESHOLD", 0.8)),
+    margin=float(os.environ.get("PLAYER_MATCH_MARGIN", 0.05)),
+    ttl=float(os.environ.get("PLAYER_INDEX_TTL", 600)),
+)
+
+# PLAYER_MATCH_ON_WRITE=true: nas escritas, um nome sem match exato que casa com um
+# único jogador (threshold + margin, ou abreviação única) resolve para ele e fica
+# salvo como apelido, virando match exato nas próximas vezes.
+PLAYER_MATCH_ON_WRITE = os.environ.get("PLAYER_MATCH_ON_WRITE", "false").lower() == "true"
+
+
+PLAYER_FIELDS = ("id", "created_at", "updated_at", "name", "rating")
+PLAYER_STATS_FIELDS = (
+    "games_played",
+    "goalkeeper_games",
+    "visitor_games",
+    "games_paid",
+    "total_paid",
+    "outstanding_debt",
+    "current_streak",
+    "longest_streak",
+    "last_game_date",
+)
 
 
 class PlayerAddSchema(BaseModel):
     name: str
 
 
+class PlayerAliasSchema(BaseModel):
+    name: str
+
+
+def remember_player(player: dict | None) -> dict | None:
+    if player:
+        player_name_cache.set(normalize_name(player["name"]), player)
+    return player
+
+
+def split_cached_names(names: list[str | None]) -> tuple[dict[str, str], list[str]]:
+    """
+    Separa os nomes (com strip, sem repetição) entre os que já estão no cache
+    e os que precisam ser buscados no banco.
+
+    Returns:
+        tuple: (mapa nome -> player_id dos encontrados no cache, nomes pendentes)
+    """
+    ids = {}
+    pending = []
+    for name in dict.fromkeys(n.strip() for n in names if n and n.strip()):
+        cached = player_name_cache.get(normalize_name(name))
+        if cached:
+            ids[name] = cached["id"]
+        else:
+            pending.append(name)
+    return ids, pending
+
+
+def match_names(keys, fuzzy: bool = False) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Resolve nomes normalizados pelo índice.
+
+    Parameters:
+        keys: Nomes normalizados.
+        fuzzy(bool): Aceita também grafias parecidas e abreviações, com as regras
+            de NameIndex.match (threshold, margin sobre o segundo jogador,
+            abreviação única). Sem ele ficam como sugestão em match_player.
+
+    Returns:
+        tuple: (mapa nome -> player_id dos nomes exatos e apelidos,
+                mapa nome -> player_id dos aceitos por similaridade)
+    """
+    resolved = {}
+    similar = {}
+    for key in keys:
+        match = player_index.lookup(key)
+        if match:
+            resolved[key] = match.player_id
+        elif fuzzy:
+            match = player_index.match(key)
+            if match:
+                similar[key] = match.player_id
+    return resolved, similar
+
+
+def check_distinct_players(ids: dict[str, str | None]) -> None:
+    """
+    Nomes diferentes da mesma chamada não podem virar o mesmo jogador (ex.: o nome
+    e um apelido dele na mesma lista): o elenco juntaria os dois em uma linha só.
+
+    Raises:
+        ValueError: Dois nomes (normalizados diferentes) com o mesmo player_id.
+    """
+    seen: dict[str, str] = {}
+    for name, player_id in ids.items():
+        if player_id is None:
+            continue
+        other = seen.setdefault(player_id, name)
+        if normalize_name(other) != normalize_name(name):
+            raise ValueError(f"Nomes diferentes para o mesmo jogador: {other}, {name}")
+
+
 class PlayerService:
-    def __init__(self):
-        self.repository = PlayerRepository()
-        self.game_player_repository = GamePlayerRepository()
+    def __init__(self, client: "Client | None" = None):
+        client = client or get_client()
+        self.repository = PlayerRepository(client)
+        self.game_player_repository = GamePlayerRepository(client)
+        self.alias_repository = PlayerAliasRepository(client)
+        self.stats_repository = PlayerStatsRepository(client)
+        self.game_repository = GameRepository(client)
+
+    def warm_cache(self) -> int:
+        """Carrega todos os jogadores no cache e no índice de nomes com um único scan em players."""
+        players = self.repository.get() or []
+        for player in players:
+            remember_player(player)
+        player_index.load(players, self.alias_repository.get())
+        return len(players)
+
+    def load_index(self) -> int:
+        """(Re)carrega o índice de nomes: um scan das colunas de nome em players e um em player_aliases."""
+        players = self.repository.get(columns="id, name, name_normalized") or []
+        player_index.load(players, self.alias_repository.get())
+        return len(player_index)
+
+    def _ensure_index(self) -> None:
+        if player_index.stale:
+            self.load_index()
+
+    def _learn_aliases(self, similar: dict[str, str]) -> dict[str, str]:
+        """
+        Salva como apelido os nomes aceitos por similaridade. Um nome que já é de
+        um jogador no banco (o índice pode estar atrasado) fica de fora, para ser
+        resolvido pelo nome exato.
+
+        Returns:
+            dict[str, str]: Mapa nome normalizado -> player_id dos apelidos salvos.
+        """
+        if not similar:
+            return {}
+        for player in self.repository.get({"name_normalized": list(similar)}, columns="name_normalized") or []:
+            similar.pop(player["name_normalized"], None)
+        for key, player_id in similar.items():
+            self.alias_repository.upsert(key, player_id)
+            player_index.add(key, player_id, alias=True)
+        if similar:
+            response_cache.invalidate_where("player_ids")
+        return similar
 
     def get_or_create_player(self, body: PlayerAddSchema | str) -> dict:
         if isinstance(body, str):
             body = PlayerAddSchema(name=body)
         body.name = body.name.strip()
-        player = self.get_player_by_name(body.name)
-        if player:
-            return player
-        return self.repository.create(body.model_dump())
+        cached = player_name_cache.get(normalize_name(body.name))
+        if cached:
+            return cached
+
+        self._ensure_index()
+        match, similar = match_names([normalize_name(body.name)], PLAYER_MATCH_ON_WRITE)
+        match.update(self._learn_aliases(similar))
+        if match:
+            return self.get_player_by_id(match.popitem()[1])
+
+        # um único INSERT ... ON CONFLICT DO NOTHING: sem corrida entre requests
+        created = self.repository.create_missing([body.model_dump()])
+        if created:
+            invalidate_players()
+            player_index.add(created[0]["name_normalized"], created[0]["id"])
+            return remember_player(created[0])
+        return self.get_player_by_name(body.name)
+
+    def get_or_create_players(self, names: list[str | None]) -> dict[str, str]:
+        """
+        Resolve uma lista de nomes para ids de jogadores. Nomes já conhecidos saem
+        do cache ou do índice de nomes (nome exato, apelido confirmado ou, com
+        PLAYER_MATCH_ON_WRITE, grafia parecida salva como apelido); os demais
+        são criados com um único INSERT em lote que ignora nomes normalizados já
+        existentes. Só os que já existiam no banco custam um SELECT com IN a mais.
+
+        Returns:
+            dict[str, str]: Mapa nome -> player_id (nomes já com strip).
+
+        Raises:
+            ValueError: Dois nomes diferentes resolvem para o mesmo jogador.
+        """
+        ids, pending = split_cached_names(names)
+        if not pending:
+            return ids
+
+        # grafias diferentes do mesmo nome viram um jogador só (vale a primeira)
+        keys = {}
+        for name in pending:
+            keys.setdefault(normalize_name(name), name)
+
+        self._ensure_index()
+        resolved, similar = match_names(keys, PLAYER_MATCH_ON_WRITE)
+        resolved.update(self._learn_aliases(similar))
+        missing = [name for key, name in keys.items() if key not in resolved]
+
+        created = self.repository.create_missing([PlayerAddSchema(name=name).model_dump() for name in missing])
+        for player in created:
+            resolved[player["name_normalized"]] = remember_player(player)["id"]
+            player_index.add(player["name_normalized"], player["id"])
+        if created:
+            invalidate_players()
+
+        existing = [key for key in keys if key not in resolved]
+        if existing:
+            for player in self.repository.get({"name_normalized": existing}) or []:
+                resolved[player["name_normalized"]] = remember_player(player)["id"]
+
+        for name in pending:
+            player_id = resolved.get(normalize_name(name))
+            if player_id:
+                ids[name] = player_id
+
+        check_distinct_players(ids)
+        return ids
 
     def get_player_by_id(self, player_id: str) -> dict | None:
         player = self.repository.get({"id": player_id})
@@ -26,18 +253,195 @@ class PlayerService:
             return player[0]
         return None
 
+    def find_player_ids(self, names: list[str | None], cache_key: str | None = None) -> dict[str, str | None]:
+        """
+        Como get_or_create_players, mas só leitura: nomes que não existem ficam com
+        None e nada é criado. Usado pelo preview de times.
+
+        Parameters:
+            names(list[str | None]): Nomes a resolver.
+            cache_key(str | None): Chave da lista (ex.: raw_key do texto); com ela o
+                resultado fica no response_cache até algum jogador ser criado/removido.
+
+        Returns:
+            dict[str, str | None]: Mapa nome (com strip) -> player_id ou None.
+        """
+        if cache_key is None:
+            return self._find_player_ids(names)
+        return response_cache.get_or_load(("player_ids", cache_key), lambda: self._find_player_ids(names))
+
+    def _find_player_ids(self, names: list[str | None]) -> dict[str, str | None]:
+        ids, pending = split_cached_names(names)
+        if not pending:
+            return ids
+
+        self._ensure_index()
+        keys = {normalize_name(name) for name in pending}
+        resolved, similar = match_names(keys, PLAYER_MATCH_ON_WRITE)
+        existing = [key for key in keys if key not in resolved]
+        if existing:
+            for player in self.repository.get({"name_normalized": existing}) or []:
+                resolved[player["name_normalized"]] = remember_player(player)["id"]
+        # o preview não grava apelidos: mostra o que a escrita resolveria
+        for key, player_id in similar.items():
+            resolved.setdefault(key, player_id)
+
+        for name in pending:
+            ids[name] = resolved.get(normalize_name(name))
+        check_distinct_players(ids)
+        return ids
+
+    def get_ratings(self, player_ids: list[str]) -> dict[str, float]:
+        """Retorna o rating salvo (players.rating) de cada jogador que tiver um."""
+        if not player_ids:
+            return {}
+        key = ("player_ratings", frozenset(player_ids))
+        return response_cache.get_or_load(key, lambda: self._load_ratings(player_ids))
+
+    def _load_ratings(self, player_ids: list[str]) -> dict[str, float]:
+        players = self.repository.get({"id": list(player_ids)}) or []
+        return {p["id"]: float(p["rating"]) for p in players if p.get("rating") is not None}
+
     def get_games_by_player_id(self, player_id: str) -> list[dict] | None:
-        return self.game_player_repository.get_games(player_id)
+        return response_cache.get_or_load(
+            ("player_games", player_id), lambda: self.game_player_repository.get_games(player_id)
+        )
+
+    def get_player_stats(self, player_id: str) -> dict | None:
+        return response_cache.get_or_load(("player_stats", player_id), lambda: self._load_player_stats(player_id))
+
+    def _load_player_stats(self, player_id: str) -> dict | None:
+        """
+        Estatísticas do jogador a partir de player_stats, mantida de forma incremental
+        pelos triggers em game_players: o custo não depende do histórico do jogador.
+
+        Returns:
+            dict | None: Estatísticas (PLAYER_STATS_FIELDS), ou None se o jogador não existe.
+        """
+        stats = self.stats_repository.get(player_id)
+        if stats is None:
+            # jogador sem nenhum jogo ainda não tem linha em player_stats
+            if not self.get_player_by_id(player_id):
+                return None
+            stats = {}
+
+        result = {"player_id": player_id}
+        for field in PLAYER_STATS_FIELDS:
+            result[field] = stats.get(field, None if field == "last_game_date" else 0)
+
+        # a sequência atual termina no último jogo dele; se já houve um jogo depois, acabou
+        if result["last_game_date"]:
+            latest = self.game_repository.get({"players_total": {"gt": 0}}, columns="game_date", limit=1)
+            if latest and latest[0]["game_date"] > result["last_game_date"]:
+                result["current_streak"] = 0
+        return result
 
     def get_player_by_name(self, name: str) -> dict | None:
         name = name.strip()
-        player = self.repository.get({"name": name})
+        cached = player_name_cache.get(normalize_name(name))
+        if cached:
+            return cached
+
+        player = self.repository.get({"name_normalized": normalize_name(name)})
         if player:
-            return player[0]
+            return remember_player(player[0])
         return None
 
-    def get_players(self) -> list[dict]:
-        return self.repository.get()
+    def match_player(self, name: str, limit: int = 5) -> list[dict]:
+        """
+        Jogadores com nome parecido com name, do mais parecido para o menos.
+
+        Returns:
+            list[dict]: {"player_id", "name", "score", "kind", "matched"}; matched
+            marca a sugestão confiável (acima do threshold e sem empate). Com
+            PLAYER_MATCH_ON_WRITE as escritas já adotam a sugestão marcada; sem ele,
+            confirme o nome como apelido (POST /players/{player_id}/aliases).
+        """
+        self._ensure_index()
+        best = player_index.match(name) if player_index.threshold > 0 else None
+        return [
+            {
+                "player_id": candidate.player_id,
+                "name": candidate.key,
+                "score": round(candidate.score, 3),
+                "kind": candidate.kind,
+                "matched": best is not None and candidate.key == best.key,
+            }
+            for candidate in player_index.candidates(name, limit)
+        ]
+
+    def add_alias(self, player_id: str, body: PlayerAliasSchema) -> dict | None:
+        """
+        Confirma name como apelido do jogador: a partir daí o nome resolve
+        direto para ele, sem passar pela similaridade.
+
+        Returns:
+            dict | None: O apelido salvo, ou None se o jogador não existe.
+        """
+        alias = normalize_name(body.name)
+        if not alias:
+            raise ValueError("Apelido vazio")
+        if not self.get_player_by_id(player_id):
+            return None
+        owner = self.repository.get({"name_normalized": alias}, columns="id")
+        if owner and owner[0]["id"] != player_id:
+            raise ValueError("Apelido é o nome de outro jogador")
+
+        saved = self.alias_repository.upsert(alias, player_id)
+        player_index.add(alias, player_id, alias=True)
+        response_cache.invalidate_where("player_ids")
+        return saved
+
+    def get_players(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> list[dict] | dict:
+        """
+        Lista os jogadores por nome.
+
+        Sem limit/cursor devolve a lista inteira, como antes. Com limit/cursor
+        devolve uma página {"items": [...], "next_cursor": str | None}.
+        """
+        key = ("players", limit, cursor, tuple(fields) if fields else None)
+        return response_cache.get_or_load(key, lambda: self._load_players(limit, cursor, fields))
+
+    def _load_players(self, limit, cursor, fields) -> list[dict] | dict:
+        if fields:
+            invalid = [f for f in fields if f not in PLAYER_FIELDS]
+            if invalid:
+                raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+            # id e name são necessários para o cursor
+            columns = ",".join(dict.fromkeys(["id", "name", *fields]))
+        else:
+            columns = "*"
+
+        after = tuple(decode_cursor(cursor, 2)) if cursor else None
+        # tabela vazia: o repositório devolve None, a resposta é a lista vazia
+        players = self.repository.get(columns=columns, limit=limit, after=after) or []
+
+        if limit is None and cursor is None:
+            if fields:
+                return [{f: player.get(f) for f in fields} for player in players]
+            return players
+
+        next_cursor = None
+        if limit is not None and len(players) == limit:
+            next_cursor = encode_cursor([players[-1]["name"], players[-1]["id"]])
+        if fields:
+            players = [{f: player.get(f) for f in fields} for player in players]
+        return {"items": players, "next_cursor": next_cursor}
 
     def delete_player(self, player_id) -> None:
-        return self.repository.delete(player_id)
+        # o delete remove em cascata as linhas de game_players: os jogos dele mudam também
+        games = self.game_player_repository.get_games(player_id) or []
+
+        player_name_cache.pop_where(lambda _, player: player["id"] == player_id)
+        player_index.remove_player(player_id)
+        result = self.repository.delete(player_id)
+
+        invalidate_player(player_id)
+        for game in games:
+            invalidate_game(game["id"])
+        return result
@@ -1,10 +1,30 @@
+import base64
+import json
 import re
 import unicodedata
 
+_SPACES_RE = re.compile(r"\s+")
+
 
 def normalize_name(name: str) -> str:
     if not name:
         return ""
     nfkd = unicodedata.normalize("NFKD", name)
     only_ascii = "".join(c for c in nfkd if not unicodedata.combining(c))
-    return re.sub(r"\s+", " ", only_ascii).strip().lower()
+    return _SPACES_RE.sub(" ", only_ascii).strip().lower()
+
+
+def encode_cursor(values: list) -> str:
+    """Cursor opaco de paginação (keyset) a partir dos valores da ordenação."""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Valores de um cursor de encode_cursor; exige exatamente size strings (vão para os filtros)."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as exc:
+        raise ValueError("Cursor inválido") from exc
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise ValueError("Cursor inválido")
+    return values
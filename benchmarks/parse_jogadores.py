@@ -0,0 +1,143 @@
+"""
+Micro-benchmark do parse da lista de jogadores (GameTeamService.parse_jogadores_raw).
+
+Compara a implementação anterior (replace_emoji no texto inteiro + re.match por
+linha + dicts) com o parser atual (máquina de estados pré-compilada + ParsedPlayer)
+em listas sintéticas grandes, incluindo a variante em streaming (linha a linha).
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/parse_jogadores.py
+    python benchmarks/parse_jogadores.py --sizes 100 1000 10000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from emoji import replace_emoji  # noqa: E402
+from src.services.game_team_service import GameTeamService, iter_jogadores  # noqa: E402
+from src.utils import normalize_name  # noqa: E402
+
+FIRST = ["João", "José", "Pedro", "Lucas", "Marcos", "André", "Thiago", "Rafael", "Bruno", "Caio"]
+LAST = ["Silva", "Souza", "Paulo", "Lima", "Gonçalves", "Araújo", "P", "Jr", "Neto", "Costa"]
+EMOJI = ["", "", "", " ⚽", " 🧤", " ✅", " 🔥"]
+
+
+def legacy_parse(jogadores_raw: str) -> list[dict]:
+    """Cópia da implementação anterior, mantida só para comparação."""
+    jogadores_raw = replace_emoji(jogadores_raw, replace="")
+    section = None
+    players = []
+    for line in jogadores_raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if "GOLEIROS" in line.upper():
+            section = "goleiros"
+            continue
+        if "DA CASA" in line.upper():
+            section = "casa"
+            continue
+        if "VISITANTES" in line.upper():
+            section = "visitantes"
+            continue
+        if "NÃO VÃO" in line.upper() or "NAO VAO" in line.upper():
+            section = "nao_vao"
+            continue
+        m = re.match(r"^\d+\.\s*(.+)$", line)
+        if not m or section is None:
+            continue
+        raw = m.group(1).strip()
+        if not raw or raw == ".":
+            continue
+        paren = re.match(r"^(.*?)\s*\(([^)]+)\)\s*$", raw)
+        invited_by_name = None
+        name_part = raw
+        if paren:
+            name_part = paren.group(1).strip()
+            invited_by_name = paren.group(2).strip()
+        if section == "nao_vao":
+            continue
+        players.append(
+            {
+                "name": normalize_name(name_part),
+                "invited_by_name": normalize_name(invited_by_name) if invited_by_name else None,
+                "is_goalkeeper": section == "goleiros",
+                "is_visitor": (section == "visitantes") or (section == "goleiros" and invited_by_name is not None),
+            }
+        )
+    # main.py copiava cada jogador mais uma vez com dict(p)
+    return [dict(p) for p in players]
+
+
+def synthetic_list(size: int, seed: int = 42) -> str:
+    rnd = random.Random(seed)
+
+    def name() -> str:
+        return f"{rnd.choice(FIRST)} {rnd.choice(LAST)}"
+
+    sections = [
+        ("🧤 GOLEIROS", max(2, size // 15), 0.2),
+        ("⚽ DA CASA", size // 2, 0.0),
+        ("VISITANTES", size // 3, 1.0),
+        ("❌ NÃO VÃO", size // 10, 0.0),
+    ]
+    lines = [f"Lista do futebol {rnd.randint(1, 28)}/11 ⚽🔥", ""]
+    for header, count, invited_ratio in sections:
+        lines.append(header)
+        for i in range(1, count + 1):
+            entry = name()
+            if rnd.random() < invited_ratio:
+                entry += f" ({name()})"
+            lines.append(f"{i}. {entry}{rnd.choice(EMOJI)}")
+        lines.append(f"{count + 1}. ")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def measure_peak(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1_000, 20_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    service = GameTeamService()
+    print(f"{'entradas':>9} {'impl':<10} {'melhor (ms)':>12} {'µs/linha':>9} {'pico mem (KiB)':>15}")
+    for size in args.sizes:
+        text = synthetic_list(size)
+        lines = text.splitlines()
+        n_lines = len(lines)
+
+        legacy = legacy_parse(text)
+        current = service.parse_jogadores_raw(text)
+        assert [p["name"] for p in legacy] == [p.name for p in current]
+
+        cases = {
+            "anterior": lambda: legacy_parse(text),
+            "atual": lambda: service.parse_jogadores_raw(text),
+            "streaming": lambda: sum(1 for _ in iter_jogadores(iter(lines))),
+        }
+        number = max(1, 20_000 // n_lines)
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=number, repeat=args.repeat)) / number
+            peak = measure_peak(fn)
+            print(f"{size:>9} {label:<10} {best * 1000:>12.3f} {best * 1e6 / n_lines:>9.2f} {peak / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Micro-benchmark da serialização das respostas JSON.
+
+Compara, em payloads no formato que o Supabase devolve (elenco com jogador e
+convidador embutidos, snapshot do jogo, lista de jogos e a resposta da geração
+de times com ParsedPlayer):
+
+    anterior  jsonable_encoder + json.dumps (JSONResponse, rotas sem response_model)
+    orjson    jsonable_encoder + ORJSONResponse (rotas ainda sem response_model)
+    tipado    validação no response_model + dump_json do pydantic (rotas tipadas)
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --roster 40 --games 2000 --repeat 7
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from src.responses import ORJSONResponse  # noqa: E402
+from src.schemas import (  # noqa: E402
+    GameSchema,
+    GameSnapshotSchema,
+    GenerateTeamsResponse,
+    RosterPlayerSchema,
+    TeamPlayerSchema,
+)
+from src.services.game_team_service import ParsedPlayer  # noqa: E402
+
+FIRST = ["João", "José", "Pedro", "Lucas", "Marcos", "André", "Thiago", "Rafael", "Bruno", "Caio"]
+LAST = ["Silva", "Souza", "Paulo", "Lima", "Gonçalves", "Araújo", "P", "Jr", "Neto", "Costa"]
+TEAMS = ["A", "B", "C"]
+
+
+def timestamp(rnd: random.Random) -> str:
+    moment = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rnd.randint(0, 60 * 60 * 24 * 365))
+    return moment.isoformat(timespec="microseconds")
+
+
+def player_row(rnd: random.Random) -> dict:
+    return {
+        "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+        "created_at": timestamp(rnd),
+        "updated_at": timestamp(rnd) if rnd.random() < 0.5 else None,
+        "name": f"{rnd.choice(FIRST)} {rnd.choice(LAST)}".lower(),
+        "rating": round(rnd.uniform(1, 10), 2) if rnd.random() < 0.8 else None,
+    }
+
+
+def game_row(rnd: random.Random, game_date: date) -> dict:
+    players_total = rnd.randint(14, 30)
+    players_paid = rnd.randint(0, players_total)
+    return {
+        "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+        "created_at": timestamp(rnd),
+        "updated_at": timestamp(rnd),
+        "game_date": game_date.isoformat(),
+        "game_price": 300.0,
+        "price_per_player": 12.0,
+        "goalkeepers_pay": False,
+        "players_total": players_total,
+        "players_paid": players_paid,
+        "players_visitors": rnd.randint(0, players_total // 3),
+        "total_amount": players_paid * 12.0,
+    }
+
+
+def roster(rnd: random.Random, size: int) -> list[dict]:
+    """Linhas de GET /games/{game_id}/players (ROSTER_COLUMNS)."""
+    rows = []
+    for i in range(size):
+        is_goalkeeper = i < 2
+        invited = rnd.random() < 0.3
+        paid = rnd.random() < 0.6
+        rows.append(
+            {
+                "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+                "created_at": timestamp(rnd),
+                "updated_at": timestamp(rnd) if paid else None,
+                "is_goalkeeper": is_goalkeeper,
+                "is_visitor": invited,
+                "paid": paid,
+                "amount_paid": 12.0 if paid else None,
+                "team": None if is_goalkeeper else TEAMS[i % len(TEAMS)],
+                "player": player_row(rnd),
+                "player_invited": player_row(rnd) if invited else None,
+            }
+        )
+    return rows
+
+
+def snapshot(rnd: random.Random, size: int) -> dict:
+    """GET /games/{game_id}/snapshot, montado como AsyncGameService._load_snapshot."""
+    game = game_row(rnd, date(2026, 10, 17))
+    players = roster(rnd, size)
+    teams: dict[str, list[str]] = {}
+    for row in players:
+        if row["team"]:
+            teams.setdefault(row["team"], []).append(row["player"]["id"])
+    game["players"] = players
+    game["teams"] = dict(sorted(teams.items()))
+    game["goalkeepers"] = [row["player"]["id"] for row in players if row["is_goalkeeper"]]
+    game["no_team"] = []
+    return game
+
+
+def teams_response(rnd: random.Random, size: int) -> dict:
+    """Resposta de POST /games/{game_id}/teams/generate (best_of) com ParsedPlayer."""
+    teams: dict[str, list[ParsedPlayer]] = {}
+    for i in range(size):
+        player = player_row(rnd)
+        teams.setdefault(TEAMS[i % len(TEAMS)], []).append(
+            ParsedPlayer(
+                name=player["name"],
+                invited_by_name=None,
+                is_goalkeeper=False,
+                is_visitor=False,
+                player_id=player["id"],
+                team=TEAMS[i % len(TEAMS)],
+                rating=player["rating"],
+            )
+        )
+    return {"game_id": str(uuid.uuid4()), "teams": teams, "score": 0.42, "runner_up_scores": [0.51, 0.66]}
+
+
+def legacy(content) -> bytes:
+    return JSONResponse(None).render(jsonable_encoder(content))
+
+
+def with_orjson(content) -> bytes:
+    return ORJSONResponse(None).render(jsonable_encoder(content))
+
+
+def typed(adapter: TypeAdapter, content, exclude_unset: bool = False) -> bytes:
+    # o mesmo caminho do FastAPI com response_model: validate_python + dump_json
+    return adapter.dump_json(adapter.validate_python(content), exclude_unset=exclude_unset)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roster", type=int, default=30)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    start = date(2026, 10, 17)
+    payloads = {
+        "elenco": (roster(rnd, args.roster), TypeAdapter(List[RosterPlayerSchema]), False),
+        "snapshot": (snapshot(rnd, args.roster), TypeAdapter(GameSnapshotSchema), False),
+        "jogos": (
+            [game_row(rnd, start - timedelta(weeks=i)) for i in range(args.games)],
+            TypeAdapter(List[GameSchema]),
+            True,
+        ),
+        "times": (
+            teams_response(rnd, args.roster),
+            TypeAdapter(Union[GenerateTeamsResponse, Dict[str, List[TeamPlayerSchema]]]),
+            True,
+        ),
+    }
+
+    print(f"{'payload':<9} {'impl':<9} {'melhor (µs)':>12} {'vs anterior':>12} {'bytes':>9}")
+    for label, (content, adapter, exclude_unset) in payloads.items():
+        expected = json.loads(legacy(content))
+        cases = {
+            "anterior": lambda: legacy(content),
+            "orjson": lambda: with_orjson(content),
+            "tipado": lambda: typed(adapter, content, exclude_unset),
+        }
+        baseline = None
+        for impl, fn in cases.items():
+            body = fn()
+            assert json.loads(body) == expected, f"{label}/{impl}: saída diferente da anterior"
+            number = max(1, 2_000_000 // len(body))
+            best = min(timeit.repeat(fn, number=number, repeat=args.repeat)) / number
+            baseline = baseline or best
+            print(f"{label:<9} {impl:<9} {best * 1e6:>12.1f} {baseline / best:>11.2f}x {len(body):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark de cold start: importa o app (main.py) em um processo novo com
+``python -X importtime`` e mostra o tempo de import por módulo.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/startup.py                # modo padrão (lazy)
+    python benchmarks/startup.py --eager        # EAGER_INIT=true
+    python benchmarks/startup.py --runs 10 --top 30
+
+Cada execução roda em um processo limpo; os números são a mediana das execuções.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def run_once(module: str, eager: bool) -> tuple[float, dict[str, int], dict[str, int]]:
+    env = dict(os.environ)
+    # Simula o ambiente do Lambda (sem .env, sem rede no import)
+    env.setdefault("AWS_LAMBDA_FUNCTION_NAME", "startup-benchmark")
+    env.setdefault("SUPABASE_URL", "https://example.supabase.co")
+    env.setdefault("SUPABASE_KEY", "benchmark")
+    env["EAGER_INIT"] = "true" if eager else "false"
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+
+    self_us: dict[str, int] = {}
+    cumulative_us: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        name = m.group(4)
+        self_us[name] = int(m.group(1))
+        # só os imports de primeiro nível entram no ranking cumulativo
+        if len(m.group(3)) <= 1:
+            cumulative_us[name] = int(m.group(2))
+    return wall, self_us, cumulative_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--eager", action="store_true", help="cria serviços e client no import (EAGER_INIT=true)")
+    args = parser.parse_args()
+
+    walls = []
+    per_module: dict[str, list[int]] = defaultdict(list)
+    per_package_self: dict[str, list[int]] = defaultdict(list)
+
+    for _ in range(args.runs):
+        wall, self_us, cumulative_us = run_once(args.module, args.eager)
+        walls.append(wall)
+        for name, us in cumulative_us.items():
+            per_module[name].append(us)
+        packages: dict[str, int] = defaultdict(int)
+        for name, us in self_us.items():
+            packages[name.split(".")[0]] += us
+        for name, us in packages.items():
+            per_package_self[name].append(us)
+
+    mode = "eager" if args.eager else "lazy"
+    print(f"import {args.module} ({mode}, {args.runs} runs)")
+    print(f"  processo (wall, mediana): {statistics.median(walls) * 1000:8.1f} ms")
+
+    print(f"\nTop {args.top} imports de primeiro nível (cumulativo, mediana):")
+    ranked = sorted(per_module.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)
+    for name, values in ranked[: args.top]:
+        print(f"  {statistics.median(values) / 1000:8.1f} ms  {name}")
+
+    print(f"\nTop {args.top} pacotes (soma do tempo próprio, mediana):")
+    ranked = sorted(per_package_self.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)
+    for name, values in ranked[: args.top]:
+        print(f"  {statistics.median(values) / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
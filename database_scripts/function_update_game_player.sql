@@ -0,0 +1,74 @@
+-- Atualiza um jogador no jogo aplicando as regras de preço em uma única chamada
+-- (mesmas regras de build_player_update em app/src/services/game_player_service.py).
+-- Usada pelo PATCH /games/{game_id}/players/{player_id} com UPDATE_GAME_PLAYER_RPC=true.
+-- Parâmetros nulos não alteram a coluna. Retorna a linha atualizada, ou nenhuma
+-- linha se o jogador não está no jogo.
+create or replace function public.update_game_player(
+  p_game uuid,
+  p_player uuid,
+  p_is_goalkeeper boolean default null,
+  p_is_visitor boolean default null,
+  p_invited_by uuid default null,
+  p_paid boolean default null,
+  p_amount_paid numeric default null,
+  p_team text default null
+)
+returns setof public.game_players
+language plpgsql
+as $$
+declare
+  g record;
+  gp public.game_players;
+  v_amount numeric := p_amount_paid;
+begin
+  select price_per_player, goalkeepers_pay
+  into g
+  from public.games
+  where id = p_game;
+
+  select *
+  into gp
+  from public.game_players
+  where game_id = p_game and player_id = p_player
+  for update;
+
+  if not found then
+    return;
+  end if;
+
+  if p_paid is true and p_amount_paid is null and g.price_per_player is null then
+    raise exception 'Para marcar o jogador como pago, é necessário informar o valor pago ou ter um preço por jogador definido no jogo.';
+  end if;
+
+  if p_is_visitor is true and p_invited_by is null then
+    raise exception 'O jogador visitante deve ter um convidador.';
+  end if;
+
+  if p_paid is true then
+    if p_is_goalkeeper is true or gp.is_goalkeeper is true then
+      if g.goalkeepers_pay is false then
+        v_amount := 0;
+      elsif g.price_per_player is not null then
+        v_amount := g.price_per_player;
+      end if;
+    elsif v_amount = 0 and g.price_per_player is not null then
+      v_amount := g.price_per_player;
+    end if;
+  end if;
+
+  return query
+  update public.game_players
+  set is_goalkeeper = coalesce(p_is_goalkeeper, is_goalkeeper),
+      is_visitor    = coalesce(p_is_visitor, is_visitor),
+      invited_by    = coalesce(p_invited_by, invited_by),
+      paid          = coalesce(p_paid, paid),
+      amount_paid   = case
+                        when v_amount is null then amount_paid
+                        when p_paid is true then v_amount
+                        else 0
+                      end,
+      team          = coalesce(p_team, team)
+  where id = gp.id
+  returning *;
+end;
+$$;
@@ -0,0 +1,4 @@
+-- In-progress lease for idempotency keys (see table_idempotency_keys.sql).
+-- For databases created before locked_at was added.
+alter table public.idempotency_keys
+  add column if not exists locked_at timestamp with time zone not null default now();
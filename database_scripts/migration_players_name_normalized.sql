@@ -0,0 +1,58 @@
+-- Chave única de nome normalizado em players (mesma regra de normalize_name em src/utils.py).
+-- Jogadores duplicados (mesmo nome normalizado) são unidos antes de criar a constraint.
+-- Para conferir os duplicados antes de rodar:
+--   select name_normalized, array_agg(name) from players group by 1 having count(*) > 1;
+create extension if not exists unaccent;
+
+begin;
+
+alter table public.players add column if not exists name_normalized text;
+
+update public.players
+set name_normalized = lower(btrim(regexp_replace(unaccent(name), '\s+', ' ', 'g')))
+where name_normalized is null;
+
+-- Jogador canônico de cada nome normalizado: o mais antigo. Os demais são duplicados.
+create temporary table player_merge on commit drop as
+select id as duplicate_id, canonical_id
+from (
+  select
+    id,
+    first_value(id) over (partition by name_normalized order by created_at, id) as canonical_id
+  from public.players
+) ranked
+where id <> canonical_id;
+
+-- Um jogo pode ter a mesma pessoa duas vezes com grafias diferentes: fica uma linha
+-- por (game_id, jogador canônico), de preferência a paga, depois a mais antiga.
+delete from public.game_players gp
+using (
+  select
+    gp.id,
+    row_number() over (
+      partition by gp.game_id, coalesce(m.canonical_id, gp.player_id)
+      order by gp.paid desc, gp.created_at, gp.id
+    ) as position
+  from public.game_players gp
+  left join player_merge m on m.duplicate_id = gp.player_id
+) ranked
+where gp.id = ranked.id and ranked.position > 1;
+
+update public.game_players gp
+set player_id = m.canonical_id
+from player_merge m
+where gp.player_id = m.duplicate_id;
+
+update public.game_players gp
+set invited_by = m.canonical_id
+from player_merge m
+where gp.invited_by = m.duplicate_id;
+
+delete from public.players p
+using player_merge m
+where p.id = m.duplicate_id;
+
+alter table public.players alter column name_normalized set not null;
+alter table public.players add constraint players_name_normalized_key unique (name_normalized);
+
+commit;
@@ -0,0 +1,3 @@
+-- Rating used by the balanced team generation (players.rating).
+-- For databases created before the column was added to table_players.sql.
+alter table public.players add column if not exists rating numeric(4, 2) null;
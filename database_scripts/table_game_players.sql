@@ -8,6 +8,7 @@ create table public.game_players (
   is_visitor boolean not null default false,
   invited_by uuid null,
   paid boolean not null default false,
+  amount_paid numeric(10, 2) null,
   team text null,
   constraint game_players_pkey primary key (id),
   constraint game_players_game_id_player_id_key unique (game_id, player_id),
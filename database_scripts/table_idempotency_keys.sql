@@ -0,0 +1,11 @@
+create table public.idempotency_keys (
+  key text not null,
+  request_hash text not null,
+  status_code integer null,
+  response_body text null,
+  content_type text null,
+  created_at timestamp with time zone not null default now(),
+  -- start of the current attempt; an unfinished key older than the lease can be retried
+  locked_at timestamp with time zone not null default now(),
+  constraint idempotency_keys_pkey primary key (key)
+) TABLESPACE pg_default;
\ No newline at end of file
@@ -0,0 +1,19 @@
+-- Deferred writes (POST /games/{game_id}/teams/generate with defer). The payload is
+-- stored with the job so any Lambda container can run it and report its status.
+create table public.jobs (
+  id uuid not null default gen_random_uuid (),
+  key text not null,
+  kind text not null,
+  payload jsonb not null,
+  status text not null default 'pending',
+  result jsonb null,
+  error text null,
+  created_at timestamp with time zone not null default now(),
+  -- start of the current run; a running job older than the lease can be taken over
+  locked_at timestamp with time zone null,
+  finished_at timestamp with time zone null,
+  constraint jobs_pkey primary key (id),
+  constraint jobs_status_check check (status in ('pending', 'running', 'done', 'error', 'superseded'))
+) TABLESPACE pg_default;
+
+create index if not exists jobs_key_created_at_idx on public.jobs (key, created_at);
@@ -0,0 +1,7 @@
+create table public.player_aliases (
+  alias_normalized text not null,
+  player_id uuid not null,
+  created_at timestamp with time zone not null default now(),
+  constraint player_aliases_pkey primary key (alias_normalized),
+  constraint player_aliases_player_id_fkey foreign KEY (player_id) references players (id) on delete CASCADE
+) TABLESPACE pg_default;
\ No newline at end of file
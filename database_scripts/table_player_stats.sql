@@ -0,0 +1,15 @@
+create table public.player_stats (
+  player_id uuid not null,
+  games_played integer not null default 0,
+  goalkeeper_games integer not null default 0,
+  visitor_games integer not null default 0,
+  games_paid integer not null default 0,
+  total_paid numeric(10, 2) not null default 0.00,
+  outstanding_debt numeric(10, 2) not null default 0.00,
+  current_streak integer not null default 0,
+  longest_streak integer not null default 0,
+  last_game_date date null,
+  updated_at timestamp with time zone not null default now(),
+  constraint player_stats_pkey primary key (player_id),
+  constraint player_stats_player_id_fkey foreign KEY (player_id) references players (id) on delete CASCADE
+) TABLESPACE pg_default;
\ No newline at end of file
@@ -3,5 +3,8 @@ create table public.players (
   created_at timestamp with time zone not null default now(),
   updated_at timestamp with time zone null,
   name text not null,
-  constraint players_pkey primary key (id)
+  name_normalized text not null,
+  rating numeric(4, 2) null,
+  constraint players_pkey primary key (id),
+  constraint players_name_normalized_key unique (name_normalized)
 ) TABLESPACE pg_default;
\ No newline at end of file
@@ -1,50 +1,83 @@
--- Keep games.players_* counters in sync with game_players changes
-create or replace function public.refresh_game_player_counts(p_game uuid)
+-- Keep games.players_* counters in sync with game_players changes.
+-- Same rules as the API used to compute on every read: players_paid counts
+-- rows with amount_paid > 0 and total_amount is the sum of amount_paid.
+create or replace function public.refresh_games_player_counts(p_games uuid[])
 returns void
-language plpgsql
+language sql
 as $$
-declare
-  totals record;
-begin
-  select
-    count(*) as total,
-    count(*) filter (where paid) as paid,
-    count(*) filter (where is_visitor) as visitors
-  into totals
-  from public.game_players
-  where game_id = p_game;
-
   update public.games g
-  set players_total     = coalesce(totals.total, 0),
-      players_paid      = coalesce(totals.paid, 0),
-      players_visitors  = coalesce(totals.visitors, 0),
-      total_amount      = coalesce(totals.paid, 0) * g.price_per_player,
+  set players_total     = t.total,
+      players_paid      = t.paid,
+      players_visitors  = t.visitors,
+      total_amount      = t.amount,
       updated_at        = now()
-  where g.id = p_game;
-end;
+  from (
+    select
+      affected.id,
+      count(gp.id) as total,
+      count(gp.id) filter (where gp.amount_paid > 0) as paid,
+      count(gp.id) filter (where gp.is_visitor) as visitors,
+      coalesce(sum(gp.amount_paid), 0) as amount
+    from unnest(p_games) as affected(id)
+    left join public.game_players gp on gp.game_id = affected.id
+    group by affected.id
+  ) t
+  where g.id = t.id;
+$$;
+
+create or replace function public.refresh_game_player_counts(p_game uuid)
+returns void
+language sql
+as $$
+  select public.refresh_games_player_counts(array[p_game]);
 $$;
 
+-- Statement-level: a bulk upsert/delete refreshes each affected game once,
+-- using the transition tables instead of one re-count per row.
 create or replace function public.trg_refresh_game_player_counts()
 returns trigger
 language plpgsql
 as $$
+declare
+  affected uuid[];
 begin
   if (TG_OP = 'INSERT') then
-    perform public.refresh_game_player_counts(NEW.game_id);
+    select array_agg(distinct game_id) into affected from new_rows;
   elsif (TG_OP = 'UPDATE') then
-    if NEW.game_id is distinct from OLD.game_id then
-      perform public.refresh_game_player_counts(OLD.game_id);
-    end if;
-    perform public.refresh_game_player_counts(NEW.game_id);
+    select array_agg(distinct game_id) into affected
+    from (select game_id from new_rows union select game_id from old_rows) changed;
   elsif (TG_OP = 'DELETE') then
-    perform public.refresh_game_player_counts(OLD.game_id);
+    select array_agg(distinct game_id) into affected from old_rows;
+  end if;
+
+  if affected is not null then
+    perform public.refresh_games_player_counts(affected);
   end if;
 
   return null;
 end;
 $$;
 
+-- Transition tables only allow one event per trigger
 drop trigger if exists trg_refresh_game_player_counts on public.game_players;
-create trigger trg_refresh_game_player_counts
-after insert or update or delete on public.game_players
-for each row execute function public.trg_refresh_game_player_counts();
+drop trigger if exists trg_refresh_game_player_counts_insert on public.game_players;
+drop trigger if exists trg_refresh_game_player_counts_update on public.game_players;
+drop trigger if exists trg_refresh_game_player_counts_delete on public.game_players;
+
+create trigger trg_refresh_game_player_counts_insert
+after insert on public.game_players
+referencing new table as new_rows
+for each statement execute function public.trg_refresh_game_player_counts();
+
+create trigger trg_refresh_game_player_counts_update
+after update on public.game_players
+referencing old table as old_rows new table as new_rows
+for each statement execute function public.trg_refresh_game_player_counts();
+
+create trigger trg_refresh_game_player_counts_delete
+after delete on public.game_players
+referencing old table as old_rows
+for each statement execute function public.trg_refresh_game_player_counts();
+
+-- Backfill existing games with the amount_paid based totals
+select public.refresh_games_player_counts(array_agg(id)) from public.games;
@@ -0,0 +1,240 @@
+-- Keep public.player_stats in sync with game_players changes.
+-- Counters and amounts are applied as deltas from the statement's transition
+-- tables (+1 per new row, -1 per old row), so a write costs the same no matter
+-- how long the player's history is. outstanding_debt is price_per_player for
+-- every unpaid row, except goalkeepers when the game has goalkeepers_pay = false.
+
+-- p_changes: jsonb array of game_players rows plus "sign" (1 or -1)
+create or replace function public.apply_player_stats_deltas(p_changes jsonb)
+returns void
+language sql
+as $$
+  insert into public.player_stats as s (
+    player_id, games_played, goalkeeper_games, visitor_games,
+    games_paid, total_paid, outstanding_debt, updated_at
+  )
+  select
+    c.player_id,
+    sum(c.sign),
+    coalesce(sum(c.sign) filter (where c.is_goalkeeper), 0),
+    coalesce(sum(c.sign) filter (where c.is_visitor), 0),
+    coalesce(sum(c.sign) filter (where c.paid), 0),
+    coalesce(sum(c.sign * coalesce(c.amount_paid, 0)), 0),
+    coalesce(sum(c.sign * case
+      -- game already deleted: its debt was removed by trg_player_stats_game_delete
+      when g.id is null or c.paid then 0
+      when c.is_goalkeeper and not g.goalkeepers_pay then 0
+      else coalesce(g.price_per_player, 0)
+    end), 0),
+    now()
+  from jsonb_to_recordset(p_changes) as c(
+    player_id uuid, game_id uuid, is_goalkeeper boolean, is_visitor boolean,
+    paid boolean, amount_paid numeric, sign integer
+  )
+  -- deleted player: its player_stats row is gone too (on delete cascade)
+  join public.players p on p.id = c.player_id
+  left join public.games g on g.id = c.game_id
+  group by c.player_id
+  on conflict (player_id) do update
+  set games_played     = s.games_played + excluded.games_played,
+      goalkeeper_games = s.goalkeeper_games + excluded.goalkeeper_games,
+      visitor_games    = s.visitor_games + excluded.visitor_games,
+      games_paid       = s.games_paid + excluded.games_paid,
+      total_paid       = s.total_paid + excluded.total_paid,
+      outstanding_debt = s.outstanding_debt + excluded.outstanding_debt,
+      updated_at       = now();
+$$;
+
+-- Attendance streaks over the games that have at least one player, in date
+-- order. current_streak is the streak that ends at last_game_date; the API
+-- reports it as 0 when a later game was played without the player.
+-- p_players null refreshes every player.
+create or replace function public.refresh_player_streaks(p_players uuid[])
+returns void
+language sql
+as $$
+  with played as (
+    select g.id, g.game_date, row_number() over (order by g.game_date) as seq
+    from public.games g
+    where exists (select 1 from public.game_players gp where gp.game_id = g.id)
+  ),
+  attended as (
+    select
+      gp.player_id,
+      p.seq,
+      p.game_date,
+      p.seq - row_number() over (partition by gp.player_id order by p.seq) as island
+    from public.game_players gp
+    join played p on p.id = gp.game_id
+    where p_players is null or gp.player_id = any (p_players)
+  ),
+  islands as (
+    select player_id, count(*) as streak, max(seq) as last_seq, max(game_date) as last_date
+    from attended
+    group by player_id, island
+  ),
+  summary as (
+    select
+      player_id,
+      max(streak) as longest,
+      (array_agg(streak order by last_seq desc))[1] as current,
+      max(last_date) as last_date
+    from islands
+    group by player_id
+  )
+  update public.player_stats s
+  set current_streak = coalesce(sm.current, 0),
+      longest_streak = coalesce(sm.longest, 0),
+      last_game_date = sm.last_date,
+      updated_at     = now()
+  from public.player_stats target
+  left join summary sm on sm.player_id = target.player_id
+  where s.player_id = target.player_id
+    and (p_players is null or target.player_id = any (p_players));
+$$;
+
+create or replace function public.trg_apply_player_stats()
+returns trigger
+language plpgsql
+as $$
+declare
+  changes jsonb := '[]'::jsonb;
+  moved uuid[];
+begin
+  if (TG_OP in ('INSERT', 'UPDATE')) then
+    select changes || coalesce(jsonb_agg(to_jsonb(n) || '{"sign": 1}'), '[]'::jsonb)
+    into changes from new_rows n;
+  end if;
+  if (TG_OP in ('UPDATE', 'DELETE')) then
+    select changes || coalesce(jsonb_agg(to_jsonb(o) || '{"sign": -1}'), '[]'::jsonb)
+    into changes from old_rows o;
+  end if;
+
+  if jsonb_array_length(changes) > 0 then
+    perform public.apply_player_stats_deltas(changes);
+
+    -- Streaks only move when attendance does: a row inserted, deleted or moved
+    -- to another player/game. An update that keeps (id, player_id, game_id),
+    -- like marking a payment, cancels out (+1 -1) and skips the rebuild.
+    select coalesce(array_agg(distinct m.player_id), '{}')
+    into moved
+    from (
+      select (c ->> 'player_id')::uuid as player_id
+      from jsonb_array_elements(changes) c
+      group by c ->> 'id', c ->> 'player_id', c ->> 'game_id'
+      having sum((c ->> 'sign')::integer) <> 0
+    ) m;
+
+    if cardinality(moved) > 0 then
+      perform public.refresh_player_streaks(moved);
+    end if;
+  end if;
+
+  return null;
+end;
+$$;
+
+-- Price rules changed: move the game's unpaid rows to the new amount due
+create or replace function public.trg_player_stats_game_price()
+returns trigger
+language plpgsql
+as $$
+begin
+  update public.player_stats s
+  set outstanding_debt = s.outstanding_debt + d.delta,
+      updated_at       = now()
+  from (
+    select
+      gp.player_id,
+      sum(
+        case when gp.is_goalkeeper and not NEW.goalkeepers_pay then 0 else coalesce(NEW.price_per_player, 0) end
+        - case when gp.is_goalkeeper and not OLD.goalkeepers_pay then 0 else coalesce(OLD.price_per_player, 0) end
+      ) as delta
+    from public.game_players gp
+    where gp.game_id = NEW.id and not gp.paid
+    group by gp.player_id
+  ) d
+  where s.player_id = d.player_id;
+
+  return null;
+end;
+$$;
+
+-- Game deleted: its debt goes away before the cascade removes the rows
+create or replace function public.trg_player_stats_game_delete()
+returns trigger
+language plpgsql
+as $$
+begin
+  update public.player_stats s
+  set outstanding_debt = s.outstanding_debt - d.due,
+      updated_at       = now()
+  from (
+    select
+      gp.player_id,
+      sum(case when gp.is_goalkeeper and not OLD.goalkeepers_pay then 0 else coalesce(OLD.price_per_player, 0) end) as due
+    from public.game_players gp
+    where gp.game_id = OLD.id and not gp.paid
+    group by gp.player_id
+  ) d
+  where s.player_id = d.player_id;
+
+  return OLD;
+end;
+$$;
+
+create or replace function public.trg_player_stats_refresh_streaks()
+returns trigger
+language plpgsql
+as $$
+begin
+  perform public.refresh_player_streaks(null);
+  return null;
+end;
+$$;
+
+-- Transition tables only allow one event per trigger
+drop trigger if exists trg_apply_player_stats_insert on public.game_players;
+drop trigger if exists trg_apply_player_stats_update on public.game_players;
+drop trigger if exists trg_apply_player_stats_delete on public.game_players;
+drop trigger if exists trg_player_stats_game_price on public.games;
+drop trigger if exists trg_player_stats_game_delete on public.games;
+drop trigger if exists trg_player_stats_refresh_streaks on public.games;
+
+create trigger trg_apply_player_stats_insert
+after insert on public.game_players
+referencing new table as new_rows
+for each statement execute function public.trg_apply_player_stats();
+
+create trigger trg_apply_player_stats_update
+after update on public.game_players
+referencing old table as old_rows new table as new_rows
+for each statement execute function public.trg_apply_player_stats();
+
+create trigger trg_apply_player_stats_delete
+after delete on public.game_players
+referencing old table as old_rows
+for each statement execute function public.trg_apply_player_stats();
+
+create trigger trg_player_stats_game_price
+after update of price_per_player, goalkeepers_pay on public.games
+for each row
+when (OLD.price_per_player is distinct from NEW.price_per_player or OLD.goalkeepers_pay is distinct from NEW.goalkeepers_pay)
+execute function public.trg_player_stats_game_price();
+
+create trigger trg_player_stats_game_delete
+before delete on public.games
+for each row execute function public.trg_player_stats_game_delete();
+
+-- Removing a game renumbers the sequence of played games for everyone
+create trigger trg_player_stats_refresh_streaks
+after delete on public.games
+for each statement execute function public.trg_player_stats_refresh_streaks();
+
+-- Backfill (safe to re-run: rebuilds from scratch)
+truncate public.player_stats;
+
+select public.apply_player_stats_deltas(
+  coalesce((select jsonb_agg(to_jsonb(gp) || '{"sign": 1}') from public.game_players gp), '[]'::jsonb)
+);
+select public.refresh_player_streaks(null);
@@ -37,6 +37,7 @@ resource "aws_lambda_function" "this" {
   environment {
     variables = merge({
       "AWS_LAMBDA_EXEC_WRAPPER": "/opt/bootstrap"
+      "AWS_LWA_INVOKE_MODE": "response_stream"
       "PORT": 8000
     }, var.environment)
   }
@@ -50,6 +51,8 @@ resource "aws_lambda_function" "this" {
 resource "aws_lambda_function_url" "example" {
   function_name      = aws_lambda_function.this.function_name
   authorization_type = "NONE"
+  # /export/* streams the body (StreamingResponse)
+  invoke_mode        = "RESPONSE_STREAM"
 }
 
 # Log Group